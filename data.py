@@ -1,6 +1,9 @@
+import argparse
 from glob import glob
 from pathlib import Path
+from typing import List
 
+from joblib import Memory
 import pandas as pd
 
 from src.air_quality import AirQualityProcessor
@@ -9,26 +12,139 @@ from src.downloader import Downloader
 from src.pedestrian_count import PedestrianCountProcessor
 
 
-if __name__ == '__main__':
-    DATA_DIR = Path('data')
-    WEB_DIR = Path('web')
+DATA_DIR = Path('data')
+WEB_DIR = Path('web')
+AIR_QUALITY_INPUT = DATA_DIR/'air_quality/2022_air_quality_vic.xlsx'
+AIR_QUALITY_OUTPUT = WEB_DIR/'data/air_quality/air_quality_final.csv'
+PEDESTRIAN_OUTPUT = WEB_DIR/'data/pedestrian/pedestrian_count_final.csv'
+STAGES = ['download', 'air', 'ped', 'all']
+INPUT_CACHE_DIR = DATA_DIR/'.cache/inputs'
 
-    # Download air quality and pedestrian activity data
-    data_downloader = Downloader()
-    data_downloader.download()
 
-    # Preprocess air quality data
-    air_quality_processor = AirQualityProcessor()
-    air_quality_df = pd.read_excel(DATA_DIR/'air_quality/2022_air_quality_vic.xlsx', sheet_name='AllData')
+def is_up_to_date(output: Path, inputs: List[Path]) -> bool:
+    """
+    Check whether a stage output is newer than all of its inputs, so the stage can be skipped.
+
+    Parameters
+    ----------
+    output : Path
+        Output file of the stage.
+    inputs : List[Path]
+        Input files of the stage.
+
+    Returns
+    -------
+    bool
+        True if the output exists and is newer than every input, False otherwise.
+    """
+
+    if not output.exists() or not inputs:
+        return False
+    return output.stat().st_mtime > max(Path(path).stat().st_mtime for path in inputs)
+
+
+def _read_air_quality_workbook(path: Path, mtime: float, cols_to_drop: List[str]) -> pd.DataFrame:
+    """
+    Read the raw air quality workbook.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the air quality workbook.
+    mtime : float
+        Modification time of the workbook, only used as part of the cache key.
+    cols_to_drop : List[str]
+        Unused columns to skip at read time.
+
+    Returns
+    -------
+    pd.DataFrame
+        Raw air quality data.
+    """
+
+    # calamine parses the workbook in Rust, which is much faster than the default openpyxl engine
+    # The engine was added in pandas 2.2, hence the version pin in requirements.txt
+    return pd.read_excel(
+        path,
+        sheet_name='AllData',
+        engine='calamine',
+        usecols=lambda col: col not in cols_to_drop  # Skip unused columns at read time
+    )
+
+
+def read_air_quality(path: Path, mtime: float, cols_to_drop: List[str]) -> pd.DataFrame:
+    """
+    Read the raw air quality workbook. The parsed DataFrame is cached on disk and keyed by the
+    file's modification time, so the workbook is only parsed again after it changes.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the air quality workbook.
+    mtime : float
+        Modification time of the workbook, only used as part of the cache key.
+    cols_to_drop : List[str]
+        Unused columns to skip at read time.
+
+    Returns
+    -------
+    pd.DataFrame
+        Raw air quality data.
+    """
+
+    # The cache is created here rather than at import time, so importing this module does not create it
+    memory = Memory(INPUT_CACHE_DIR, verbose=0)
+    df = memory.cache(_read_air_quality_workbook)(path, mtime, cols_to_drop)
+    # Entries for older modification times can never be hit again, only the latest one is kept
+    memory.reduce_size(items_limit=1)
+
+    return df
+
+
+def process_air_quality(force: bool = False, fill_diurnal_medians: bool = False) -> None:
+    """
+    Preprocess the air quality data and save it for the web visualization.
+
+    Parameters
+    ----------
+    force : bool
+        Rerun the stage even if its output is up to date.
+    fill_diurnal_medians : bool
+        Fill null values with location and hour of day medians before imputing. The stage
+        always reruns with this option, since the up-to-date check only compares mtimes.
+    """
+
+    air_quality_processor = AirQualityProcessor(fill_diurnal_medians=fill_diurnal_medians)
+    # The existing output may have been imputed without the diurnal medians, so it is not reused
+    if not (force or fill_diurnal_medians) and is_up_to_date(AIR_QUALITY_OUTPUT, [AIR_QUALITY_INPUT]):
+        air_quality_processor.logger.info(f"{AIR_QUALITY_OUTPUT} is up to date. Skipping...")
+        return
+
+    air_quality_df = read_air_quality(
+        AIR_QUALITY_INPUT, AIR_QUALITY_INPUT.stat().st_mtime, air_quality_processor.cols_to_drop
+    )
     air_quality_df = air_quality_processor.transform(air_quality_df)
-    air_quality_processor.save_data(air_quality_df, WEB_DIR/'data/air_quality/air_quality_final.csv')
+    air_quality_processor.save_data(air_quality_df, AIR_QUALITY_OUTPUT)
+
+
+def process_pedestrian(force: bool = False) -> None:
+    """
+    Preprocess the pedestrian data, map the areas to their coordinates, and save it for the web visualization.
+
+    Parameters
+    ----------
+    force : bool
+        Rerun the stage even if its output is up to date.
+    """
 
-    # Preprocess pedestrian data
     pedestrian_processor = PedestrianCountProcessor()
     pedestrian_files = glob(str(DATA_DIR/'pedestrian/*_pedestrian_level.csv'))
-    pedestrian_dfs = [pd.read_csv(file) for file in pedestrian_files if file != 'pedestrian_count_final.csv']
-    pedestrian_df = pd.concat(pedestrian_dfs)
-    pedestrian_df = pedestrian_processor.transform(pedestrian_df)
+    if not force and is_up_to_date(PEDESTRIAN_OUTPUT, pedestrian_files):
+        pedestrian_processor.logger.info(f"{PEDESTRIAN_OUTPUT} is up to date. Skipping...")
+        return
+
+    # Clean each monthly file as it is read so only one raw file is held in memory at a time
+    pedestrian_df = pedestrian_processor.transform_chunks(pd.read_csv(file) for file in pedestrian_files)
 
     # Create and save area and latlong mapping
     location_df = pedestrian_df[['nominatim_area']].copy()
@@ -37,7 +153,33 @@ if __name__ == '__main__':
     location_df = area_mapper.map_area_coordinates(location_df)
 
     # Join the area and latlong mapping to the pedestrian data
-    pedestrian_df = pd.merge(pedestrian_df, location_df, on="nominatim_area", how="left")
-    pedestrian_df = pedestrian_df.drop(columns=["nominatim_area"], axis=1)
-    pedestrian_processor.save_data(pedestrian_df, WEB_DIR/'data/pedestrian/pedestrian_count_final.csv')
+    # The mapping has one row per area, so a hash lookup per row avoids materialising a full merge
+    area_coordinates = location_df.set_index("nominatim_area")
+    pedestrian_df['latitude'] = pedestrian_df['nominatim_area'].map(area_coordinates['latitude'])
+    pedestrian_df['longitude'] = pedestrian_df['nominatim_area'].map(area_coordinates['longitude'])
+    del pedestrian_df['nominatim_area']
+    pedestrian_processor.save_data(pedestrian_df, PEDESTRIAN_OUTPUT)
 
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Download and preprocess the air quality and pedestrian data.")
+    parser.add_argument('--stage', choices=STAGES, default='all', help="Pipeline stage to run (default: all)")
+    parser.add_argument('--force', action='store_true', help="Rerun stages even if their outputs are up to date")
+    parser.add_argument(
+        '--diurnal-medians', action='store_true',
+        help="Fill air quality gaps with location and hour of day medians before imputing, this changes the imputed values"
+    )
+    args = parser.parse_args()
+
+    # Download air quality and pedestrian activity data
+    if args.stage in ['download', 'all']:
+        data_downloader = Downloader()
+        data_downloader.download()
+
+    # Preprocess air quality data
+    if args.stage in ['air', 'all']:
+        process_air_quality(force=args.force, fill_diurnal_medians=args.diurnal_medians)
+
+    # Preprocess pedestrian data
+    if args.stage in ['ped', 'all']:
+        process_pedestrian(force=args.force)
@@ -1,4 +1,7 @@
 import logging
+from pathlib import Path
+
+from joblib import Memory
 import pandas as pd
 import numpy as np
 
@@ -12,6 +15,31 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Season lookup table indexed by month number (index 0 is unused)
+SEASONS_BY_MONTH = np.array([
+    '', 'summer', 'summer', 'autumn', 'autumn', 'autumn', 'winter',
+    'winter', 'winter', 'spring', 'spring', 'spring', 'summer'
+], dtype=object)
+
+
+def _impute_features(features: np.ndarray) -> np.ndarray:
+    """
+    Fit an IterativeImputer on the features and return the imputed features.
+
+    Parameters
+    ----------
+    features : np.ndarray
+        2D array of numeric features containing null values.
+
+    Returns
+    -------
+    np.ndarray
+        2D array of imputed features.
+    """
+
+    imputer = IterativeImputer(max_iter=10, random_state=0)
+    return imputer.fit_transform(features)
+
 
 class AirQualityProcessor:
     """
@@ -26,6 +54,18 @@ class AirQualityProcessor:
         List of unused columns to drop.
     num_cols: list
         List of numeric columns.
+    pollutant_cols: list
+        List of measurement columns aggregated with the median.
+    non_negative_cols: list
+        List of pollutant columns whose negative readings are clipped to 0.
+    fill_diurnal_medians: bool
+        Whether to fill null values with the median of the same location and hour of day before
+        imputing. This changes the imputed values, so it is off by default.
+    cache_dir: pathlib.Path
+        Directory for caching imputation results across runs.
+    memory: joblib.Memory
+        Disk cache used to skip refitting the imputer on unchanged inputs, created on first use
+        so that constructing a processor does not create the cache directory.
     logger: logging.Logger
         Logger for logging messages.
 
@@ -33,6 +73,8 @@ class AirQualityProcessor:
     -------
     _cast_column_types(df: pd.DataFrame) -> pd.DataFrame
         Cast column types to numeric.
+    _fill_diurnal_medians(df: pd.DataFrame) -> pd.DataFrame
+        Fill null values using the median of the same location and hour of day.
     _fill_null_valuse(df: pd.DataFrame) -> pd.DataFrame
         Fill null values using IterativeImputer.
     clean(df: pd.DataFrame) -> pd.DataFrame
@@ -47,13 +89,18 @@ class AirQualityProcessor:
         Save the data to a CSV file.
     """
 
-    def __init__(self):
+    def __init__(self, fill_diurnal_medians: bool = False, cache_dir: Path = Path('data/.cache')):
         self.measurements_to_exclude = ["BSP", "SWS", "VWD", "VWS", "Sigma05", "BPM2.5", "SIG05"]
         self.cols_to_drop = [
             "datetime_local", "location_id", "validation_flag", "parameter_method_name", 
             "parameter_description", "unit_of_measure", "method_quality", "analysis_method_name"
         ]
         self.num_cols = ['latitude', 'longitude', 'CO', 'DBT', 'NO2', 'O3', 'PM10', 'PM2.5', 'SO2'] 
+        self.pollutant_cols = ['CO', 'DBT', 'NO2', 'O3', 'PM10', 'PM2.5', 'SO2']
+        self.non_negative_cols = [col for col in self.pollutant_cols if col != 'DBT']
+        self.fill_diurnal_medians = fill_diurnal_medians
+        self.cache_dir = cache_dir
+        self.memory = None
         self.logger = logging.getLogger(__name__)
 
     def _cast_column_types(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -71,15 +118,44 @@ class AirQualityProcessor:
             DataFrame with casted column types.
         """
 
-        for col in self.num_cols:
-            df[col] = df[col].astype(float)
-        df['datetime_AEST'] = pd.to_datetime(df['datetime_AEST'])
+        # Cast all numeric columns as one block instead of one column at a time
+        df[self.num_cols] = df[self.num_cols].astype(float)
+        # The workbook reader may already return datetimes, which do not need to be parsed again
+        if not pd.api.types.is_datetime64_any_dtype(df['datetime_AEST']):
+            df['datetime_AEST'] = pd.to_datetime(df['datetime_AEST'])
+
+        return df
+
+    def _fill_diurnal_medians(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill null values with the median of the same location and hour of day. Coordinates are
+        constant for a location and pollutant concentrations follow a daily cycle, so this fills
+        most gaps cheaply and leaves only the remaining ones to IterativeImputer.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame to fill null values.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with null values filled where the location and hour have readings.
+        """
+
+        locations = df.groupby('location_name', observed=True)
+        for col in ['latitude', 'longitude']:
+            df[col] = df[col].fillna(locations[col].transform('first'))
+
+        location_hours = df.groupby(['location_name', df['datetime_AEST'].dt.hour], observed=True)
+        df[self.pollutant_cols] = df[self.pollutant_cols].fillna(location_hours[self.pollutant_cols].transform('median'))
 
         return df
 
     def _fill_null_valuse(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Fill null values using IterativeImputer.
+        Fill null values using IterativeImputer. The imputed values are cached on disk,
+        so rerunning the pipeline on the same input skips the expensive imputer fit.
 
         Parameters
         ----------
@@ -92,15 +168,21 @@ class AirQualityProcessor:
             DataFrame with filled null values.
         """
 
-        knn_imputer = IterativeImputer(max_iter=10, random_state=0)
-        features = df[self.num_cols]
+        features = df[self.num_cols].copy()
+        if not features.isnull().values.any():
+            return df
+
         # IterativeImputer will raise an error when all values in the column are null
         # Thus, we just replace them with a constant value 0
         for col in features.columns:
             if features[col].isnull().all():
                 features[col] = 0
-        knn_imputer.fit(features)
-        df[self.num_cols] = np.where(df[self.num_cols].isnull(), knn_imputer.transform(features), df[self.num_cols])
+        if self.memory is None:
+            self.memory = Memory(self.cache_dir/'imputer', verbose=0)
+        imputed = self.memory.cache(_impute_features)(features.to_numpy(dtype=float))
+        # Only the latest imputation is needed for the next run, older entries are dropped
+        self.memory.reduce_size(items_limit=1)
+        df[self.num_cols] = np.where(df[self.num_cols].isnull(), imputed, df[self.num_cols])
 
         return df
 
@@ -119,19 +201,7 @@ class AirQualityProcessor:
             DataFrame with season.
         """
 
-        df['season'] = np.where(
-            df['month'].isin([12, 1, 2]), 
-            'summer', 
-            np.where(
-                df['month'].isin([3, 4, 5]), 
-                'autumn', 
-                np.where(
-                    df['month'].isin([6, 7, 8]), 
-                    'winter', 
-                    'spring'
-                )
-            )
-        )
+        df['season'] = SEASONS_BY_MONTH[df['month'].to_numpy()]
 
         return df
 
@@ -139,10 +209,10 @@ class AirQualityProcessor:
         """
         Clean the data by:
         - Filtering out unrelated measurements.
-        - Dropping unused columns.
-        - Pivoting the data from wide to long format.
+        - Pivoting the data from wide to long format, which leaves out the unused columns.
         - Casting column types.
-        - Imputing null values.
+        - Filling null values with the median of the same location and hour of day, if fill_diurnal_medians is set.
+        - Imputing the remaining null values.
         - Converting negative values to 0 for numeric columns except latitude, longitude, and temperature values.
 
         Parameters
@@ -156,8 +226,11 @@ class AirQualityProcessor:
             Cleaned DataFrame.
         """
 
-        df = df.query("parameter_name not in @self.measurements_to_exclude")
-        df = df.drop(columns=self.cols_to_drop, axis=1)
+        # Categorical codes make the measurement filter and the pivot keys integer comparisons
+        df = df.astype({"parameter_name": "category", "location_name": "category"})
+        df = df[~df["parameter_name"].isin(self.measurements_to_exclude)]
+        # The pivot only reads the key and value columns, so the unused columns are left
+        # out by it instead of being dropped with a separate copy of the frame
         df = df.pivot(
             index=["datetime_AEST", "location_name", "latitude", "longitude"],
             columns="parameter_name", 
@@ -165,10 +238,10 @@ class AirQualityProcessor:
         ).reset_index()
         
         df = self._cast_column_types(df)
+        if self.fill_diurnal_medians:
+            df = self._fill_diurnal_medians(df)
         df = self._fill_null_valuse(df)
-        for col in self.num_cols:
-            if col not in ['latitude', 'longitude', 'DBT']:
-                df[col] = np.where(df[col] < 0, 0, df[col])
+        df[self.non_negative_cols] = df[self.non_negative_cols].clip(lower=0)
 
         return df
 
@@ -187,10 +260,15 @@ class AirQualityProcessor:
             Wrangled DataFrame.
         """
 
-        df['month'] = df['datetime_AEST'].dt.month
-        df['date'] = df['datetime_AEST'].dt.date
-        df['day'] = df['datetime_AEST'].dt.day
-        df['hour'] = df['datetime_AEST'].dt.hour
+        # Derive the features with integer arithmetic on the datetime64 buffer, which also keeps
+        # date as datetime64 instead of building a Python date object per row
+        timestamps = df['datetime_AEST'].to_numpy(dtype='datetime64[ns]')
+        dates = timestamps.astype('datetime64[D]')
+        months = timestamps.astype('datetime64[M]')
+        df['month'] = (months.astype(np.int64) % 12 + 1).astype(np.int32)
+        df['date'] = dates
+        df['day'] = ((dates - months.astype('datetime64[D]')).astype(np.int64) + 1).astype(np.int32)
+        df['hour'] = (timestamps - dates).astype('timedelta64[h]').astype(np.int32)
         df = self._get_season(df)
 
         return df
@@ -211,15 +289,13 @@ class AirQualityProcessor:
             Aggregated DataFrame.
         """
 
-        df = df.groupby(["datetime_AEST", "month", "date", "day", "hour", "season"]).agg({
-            "CO": "median",
-            "DBT": "median",
-            "NO2": "median",
-            "O3": "median",
-            "PM10": "median",
-            "PM2.5": "median",
-            "SO2": "median"
-        }).reset_index()
+        # The other temporal features are derived from datetime_AEST, so grouping by it alone
+        # gives the same groups with a single int64 key instead of six mixed-type keys
+        # The group codes are computed once and shared by both reductions
+        grouped = df.groupby("datetime_AEST", sort=True)
+        time_features = grouped[["month", "date", "day", "hour", "season"]].first()
+        medians = grouped[self.pollutant_cols].median()
+        df = pd.concat([time_features, medians], axis=1).reset_index()
 
         return df
 
@@ -33,9 +33,17 @@ class AreaMapper:
         Name of the area coordinates file.
     area_mapping_fname : str
         Name of the area mapping file.
+    geocode_cache_fname : str
+        Name of the per-area geocoding cache file.
+    request_interval : float
+        Number of seconds to wait between Nominatim API requests.
 
     Methods
     -------
+    _load_geocode_cache() -> Dict[str, Dict[str, Any]]
+        Load the per-area geocoding cache.
+    _save_geocode_cache(geocode_cache: Dict[str, Dict[str, Any]]) -> None
+        Save the per-area geocoding cache.
     _find_area_coordinates(area_list: List[str]) -> List[Dict[str, Any]]
         Find the latitude and longitude coordinates for each pedestrian area.
     map_area_coordinates(location_df: pd.DataFrame) -> pd.DataFrame
@@ -48,6 +56,8 @@ class AreaMapper:
         self.logger = logging.getLogger(__name__)
         self.area_coordinates_fname = 'area_coordinates.json'
         self.area_mapping_fname = 'area_mapping.csv'
+        self.geocode_cache_fname = 'geocode_cache.json'
+        self.request_interval = 1.1 # Nominatim usage policy allows at most 1 request per second
 
         if not self.save_dir.exists():
             self.logger.info(f"Area mapping directory {self.save_dir} does not exist. Creating...")
@@ -55,9 +65,53 @@ class AreaMapper:
         else:
             self.logger.info(f"Area mapping directory {self.save_dir} exists.")
 
+    def _load_geocode_cache(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the per-area geocoding cache. Without a cache file, the cache is seeded with the
+        successful lookups of an area coordinates file saved by an earlier run.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            Dictionary mapping normalized area names to their Nominatim results.
+        """
+
+        if (self.save_dir/self.geocode_cache_fname).exists():
+            with open(self.save_dir/self.geocode_cache_fname, "r") as f:
+                return json.load(f)
+
+        if (self.save_dir/self.area_coordinates_fname).exists():
+            self.logger.info(f"Seeding geocoding cache from {self.save_dir/self.area_coordinates_fname}...")
+            with open(self.save_dir/self.area_coordinates_fname, "r") as f:
+                location_mapping = json.load(f)
+            # Failed lookups are saved as empty lists, they are left out so they are queried again
+            return {
+                result["query_area"].strip().lower(): result
+                for result in location_mapping
+                if isinstance(result, dict) and "query_area" in result
+            }
+
+        return {}
+
+    def _save_geocode_cache(self, geocode_cache: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Save the per-area geocoding cache.
+
+        Parameters
+        ----------
+        geocode_cache : Dict[str, Dict[str, Any]]
+            Dictionary mapping normalized area names to their Nominatim results.
+        """
+
+        with open(self.save_dir/self.geocode_cache_fname, "w") as f:
+            json.dump(geocode_cache, f, indent=4)
+
     def _find_area_coordinates(self, area_list: List[str]) -> List[Dict[str, Any]]:
         """
         Find the latitude and longitude coordinates for each pedestrian area.
+        Areas found in the geocoding cache are not queried again, and every new result is
+        written to the cache straight away so an interrupted run does not lose progress.
+        Failed lookups are not cached, so they are queried again on the next run.
 
         Parameters
         ----------
@@ -94,11 +148,25 @@ class AreaMapper:
         """
 
         self.logger.info("Creating location mapping for each pedestrian area...")
+        geocode_cache = self._load_geocode_cache()
         location_mapping = []
+        last_request_time = None
         for area in area_list:
+            cache_key = area.strip().lower()
+            if geocode_cache.get(cache_key):
+                self.logger.info(f"Found cached coordinates for {area}.")
+                location_mapping.append({**geocode_cache[cache_key], "query_area": area})
+                continue
+
             self.logger.info(f"Querying {area}...")
 
-            time.sleep(5) # Add a timeout to avoid overloading the API
+            # Only wait for what is left of the request interval, the time spent on the
+            # previous request already counts towards the API rate limit
+            if last_request_time is not None:
+                wait_time = self.request_interval - (time.monotonic() - last_request_time)
+                if wait_time > 0:
+                    time.sleep(wait_time)
+            last_request_time = time.monotonic()
             app = Nominatim(user_agent="tutorial")
 
             location = app.geocode(query=area, country_codes="au")
@@ -110,14 +178,16 @@ class AreaMapper:
                 result = location.raw
                 result["query_area"] = area
                 location_mapping.append(result)
-
-        return location_mapping
+                geocode_cache[cache_key] = result
+                self._save_geocode_cache(geocode_cache)
 
         json_obj = json.dumps(location_mapping, indent=4)
         with open(self.save_dir/self.area_coordinates_fname, "w") as f:
             f.write(json_obj)
         self.logger.info(f"Location mapping saved to {self.save_dir/self.area_coordinates_fname}")
 
+        return location_mapping
+
     def map_area_coordinates(self, location_df: pd.DataFrame) -> pd.DataFrame:
         """
         Map the pedestrian areas to their corresponding latitude and longitude coordinates in the pedestrian data 
@@ -136,30 +206,23 @@ class AreaMapper:
 
         self.logger.info("Creating area to coordinates mapping...")
 
-        # Load location mapping directly if exists
-        if (self.save_dir/self.area_coordinates_fname).exists():
-            self.logger.info(f'Found existing location mapping file {self.save_dir/self.area_coordinates_fname}. Loading...')
-            with open(self.save_dir/self.area_coordinates_fname, "r") as f:
-                location_mapping = json.load(f)
-        # Create area-coordinates mapping otherwise
-        else:
-            self.logger.info(f"Location mapping file {self.save_dir/self.area_coordinates_fname} does not exist. Creating...")
-            area_list = location_df['nominatim_area'].unique().tolist()
-            location_mapping = self._find_area_coordinates(area_list)
-
-        # A dictionary containing area to coordinates mapping (e.g. {"area_name": (latitude, longitude)})
-        area_to_coordinates = {
-            result["query_area"].strip().lower(): (result["lat"], result["lon"])
-            for result in location_mapping
-            if isinstance(result, dict) and "query_area" in result and "lat" in result and "lon" in result
-        }
-        # Add latitude and longitude columns to the DataFrame
-        location_df['latitude'] = location_df['nominatim_area'].apply(
-            lambda x: area_to_coordinates.get(x.strip().lower(), (None, None))[0]  # Get latitude or None
-        )
-        location_df['longitude'] = location_df['nominatim_area'].apply(
-            lambda x: area_to_coordinates.get(x.strip().lower(), (None, None))[1]  # Get longitude or None
-        )
+        # Always go through the per-area geocoding cache, so only new and previously failed areas are queried
+        area_list = location_df['nominatim_area'].unique().tolist()
+        location_mapping = self._find_area_coordinates(area_list)
+
+        # A lookup table of area to coordinates mapping indexed by the normalized area name
+        area_coordinates = pd.DataFrame(
+            [
+                (result["query_area"].strip().lower(), result["lat"], result["lon"])
+                for result in location_mapping
+                if isinstance(result, dict) and {"query_area", "lat", "lon"} <= result.keys()
+            ],
+            columns=["area", "latitude", "longitude"]
+        ).drop_duplicates(subset="area", keep="last").set_index("area")
+        # Add latitude and longitude columns to the DataFrame with a single aligned lookup,
+        # areas without coordinates are left as NaN
+        area_keys = location_df['nominatim_area'].str.strip().str.lower()
+        location_df[['latitude', 'longitude']] = area_coordinates.reindex(area_keys).to_numpy()
 
         location_df.to_csv(self.save_dir/self.area_mapping_fname, index=False)
         self.logger.info(f"Area coordinates mapping saved to {self.save_dir/self.area_mapping_fname}")
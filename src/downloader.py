@@ -1,7 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 import logging
 import os
 from pathlib import Path
-import urllib.request
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -9,6 +14,15 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+AIR_QUALITY_URL = "https://apps.epa.vic.gov.au/datavic/Data_Vic/AirWatch/2022_All_sites_air_quality_hourly_avg_AIR-I-F-V-VH-O-S1-DB-M2-4-0.xlsx"
+AIR_QUALITY_FNAME = '2022_air_quality_vic.xlsx'
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December')
+BASE_PEDESTRIAN_URL = "https://www.pedestrian.melbourne.vic.gov.au/datadownload/"
+# (URL, file name) pair of each monthly pedestrian file, built once at import time
+PEDESTRIAN_URLS = tuple(
+    (f"{BASE_PEDESTRIAN_URL}{month}_2022.csv", f'{month}_2022_pedestrian_level.csv') for month in MONTHS
+)
+
 
 class Downloader:
     """
@@ -28,6 +42,14 @@ class Downloader:
         Directory for storing downloaded air quality web data.
     pedestrian_web_dir: pathlib.Path
         Directory for storing downloaded pedestrian web data.
+    session: requests.Session
+        HTTP session shared by all downloads so connections to the same host are reused.
+    chunk_size: int
+        Number of bytes written to disk per chunk while streaming a download.
+    timeout: int
+        Number of seconds to wait for the server before giving up on a download.
+    max_workers: int
+        Maximum number of files downloaded concurrently.
     logger: logging.Logger
         Logger for logging messages.
 
@@ -48,6 +70,14 @@ class Downloader:
         self.pedestrian_dir = self.data_dir/'pedestrian'
         self.air_quality_web_dir = self.web_dir/'data/air_quality'
         self.pedestrian_web_dir = self.web_dir/'data/pedestrian'
+        self.chunk_size = 1 << 20
+        self.timeout = 30
+        self.max_workers = 6
+        self.session = requests.Session()
+        # Retry transient server errors with a backoff instead of failing the whole file
+        # The pool holds one connection per worker so concurrent downloads do not discard connections
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        self.session.mount('https://', HTTPAdapter(max_retries=retries, pool_maxsize=self.max_workers))
         self.logger = logging.getLogger(__name__)
     
     def _setup(self) -> None:
@@ -64,20 +94,21 @@ class Downloader:
         """
 
         self.logger.info('Setting up data directory...')
-        if not self.data_dir.exists():
-            self.data_dir.mkdir(parents=True, exist_ok=True)
-        if not self.air_quality_dir.exists():
-            self.air_quality_dir.mkdir(parents=True, exist_ok=True)
-        if not self.pedestrian_dir.exists():
-            self.pedestrian_dir.mkdir(parents=True, exist_ok=True)
-        if not self.air_quality_web_dir.exists():
-            self.air_quality_web_dir.mkdir(parents=True, exist_ok=True)
-        if not self.pedestrian_web_dir.exists():
-            self.pedestrian_web_dir.mkdir(parents=True, exist_ok=True)
+        # mkdir with exist_ok is already a no-op for existing directories, so no exists() check is needed
+        # Only the leaf directories are listed, data_dir is created as their parent
+        for directory in [self.air_quality_dir, self.pedestrian_dir, self.air_quality_web_dir, self.pedestrian_web_dir]:
+            directory.mkdir(parents=True, exist_ok=True)
 
     def _download(self, url: str, save_path: Path) -> None:
         """
-        Download a file from a URL to a specified path.
+        Download a file from a URL to a specified path. The file is streamed into a `.part`
+        file next to the save path and only moved into place once it is complete. If a previous
+        run left a partial file behind, the download resumes from its size with an HTTP Range
+        request, guarded by If-Range so a file that changed upstream is downloaded again in full.
+        A partial file that the server reports as already complete (416) is moved into place, and
+        one that does not line up with the server's response is discarded and downloaded again.
+        A complete file is revalidated with If-None-Match (using the ETag saved next to it) or
+        If-Modified-Since, and the body is skipped when the server answers 304 Not Modified.
 
         Parameters
         ---------
@@ -92,15 +123,77 @@ class Downloader:
         """
 
         self.logger.info(f"Downloading {url} to {save_path}...")
+        part_path = save_path.with_name(save_path.name + '.part')
+        validator_path = part_path.with_name(part_path.name + '.validator')
+        etag_path = save_path.with_suffix(save_path.suffix + '.etag')
         try:
-            urllib.request.urlretrieve(url, save_path)
+            headers = {}
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            if offset and validator_path.exists():
+                headers['Range'] = f'bytes={offset}-'
+                headers['If-Range'] = validator_path.read_text()
+            elif save_path.exists():
+                if etag_path.exists():
+                    headers['If-None-Match'] = etag_path.read_text()
+                else:
+                    headers['If-Modified-Since'] = formatdate(save_path.stat().st_mtime, usegmt=True)
+
+            restart = False
+            with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                etag = response.headers.get('ETag')
+                # 416 means the range starts at the end of the file, which happens when a previous run
+                # wrote the last chunk but stopped before moving the partial file into place
+                if response.status_code == 416 and 'Range' in headers:
+                    if response.headers.get('Content-Range', '').rpartition('/')[2] == str(offset):
+                        self.logger.info(f"{part_path} is already complete.")
+                    else:
+                        restart = True
+                else:
+                    response.raise_for_status()
+                    if response.status_code == 304:
+                        self.logger.info(f"{save_path} is up to date. Skipping...")
+                        return
+                    # The server answers 206 when it honours the range, otherwise it sends the whole file
+                    if response.status_code == 206:
+                        # Appending is only safe when the body starts exactly where the partial file ends
+                        content_range = response.headers.get('Content-Range', '')
+                        restart = content_range.partition(' ')[2].partition('-')[0] != str(offset)
+                        mode = 'ab'
+                    else:
+                        mode = 'wb'
+                        validator = etag or response.headers.get('Last-Modified')
+                        if validator:
+                            validator_path.write_text(validator)
+                        elif validator_path.exists():
+                            validator_path.unlink()
+                    if not restart:
+                        if mode == 'ab':
+                            self.logger.info(f"Resuming {url} from byte {offset}...")
+                        with open(part_path, mode) as f:
+                            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                                f.write(chunk)
+            if restart:
+                # The partial file does not line up with the file on the server, so it is downloaded again in full
+                self.logger.warning(f"Partial download {part_path} does not match {url}. Restarting...")
+                part_path.unlink()
+                validator_path.unlink(missing_ok=True)
+                return self._download(url, save_path)
+            os.replace(part_path, save_path)
+            if validator_path.exists():
+                validator_path.unlink()
+            if etag:
+                etag_path.write_text(etag)
+            elif etag_path.exists():
+                etag_path.unlink()
             self.logger.info(f"Downloaded {url} to {save_path}")
         except Exception as e:
             self.logger.error(f"Failed to download {url}: {e}")
 
     def download(self) -> None:
         """
-        Download both air quality and pedestrian data.
+        Download both air quality and pedestrian data. The files are independent and the
+        downloads are I/O-bound, so they run concurrently in a thread pool. The HTTP session
+        is closed once the downloads finish.
 
         Parameters
         ---------
@@ -111,17 +204,23 @@ class Downloader:
         None
         """
 
-        self._setup()
-
-        air_quality_url = "https://apps.epa.vic.gov.au/datavic/Data_Vic/AirWatch/2022_All_sites_air_quality_hourly_avg_AIR-I-F-V-VH-O-S1-DB-M2-4-0.xlsx"
-        air_quality_save_path = self.air_quality_dir/'2022_air_quality_vic.xlsx'
-        self._download(url=air_quality_url, save_path=air_quality_save_path)
-
-        months = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
-        base_pedestrian_url = "https://www.pedestrian.melbourne.vic.gov.au/datadownload/"
-        for month in months:
-            pedestrian_url = base_pedestrian_url + month + "_2022.csv"
-            pedestrian_save_path = self.pedestrian_dir/f'{month}_2022_pedestrian_level.csv'
-            self._download(url=pedestrian_url, save_path=pedestrian_save_path)
+        # The session is closed at the end of the run so its pooled connections are released
+        try:
+            self._setup()
+
+            downloads = [(AIR_QUALITY_URL, self.air_quality_dir/AIR_QUALITY_FNAME)]
+            downloads += [(url, self.pedestrian_dir/fname) for url, fname in PEDESTRIAN_URLS]
+
+            # Each future is checked so an unexpected error in a worker is logged instead of lost,
+            # one failed file still does not stop the others
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self._download, url=url, save_path=save_path): url for url, save_path in downloads}
+                for future, url in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.logger.error(f"Failed to download {url}: {e}")
+        finally:
+            self.session.close()
 
         self.logger.info("Download completed.")
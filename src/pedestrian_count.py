@@ -1,6 +1,6 @@
 import logging
 import re
-from typing import List
+from typing import Iterable, List
 
 import numpy as np
 import pandas as pd
@@ -12,6 +12,15 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Runs of whitespace in the raw column names, compiled once for every monthly file
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Season lookup table indexed by month number (index 0 is unused)
+SEASONS_BY_MONTH = np.array([
+    '', 'summer', 'summer', 'autumn', 'autumn', 'autumn', 'winter',
+    'winter', 'winter', 'spring', 'spring', 'spring', 'summer'
+], dtype=object)
+
 
 class PedestrianCountProcessor:
     """
@@ -21,6 +30,8 @@ class PedestrianCountProcessor:
     ----------
     location_mapping : dict
         Dictionary mapping area names to their standard spellings.
+    location_pattern : re.Pattern
+        Compiled regex matching any of the area names in location_mapping.
     nominatim_mapping_rules : dict
         Dictionary mapping area names to their standard spellings for Nominatim API.
     cols_to_add : list
@@ -36,6 +47,8 @@ class PedestrianCountProcessor:
         Wrangle the data by pivoting it into long format and extracting area names.
     transform(df: pd.DataFrame) -> pd.DataFrame
         Transform the data by cleaning, wrangling, and aggregating it.
+    transform_chunks(dfs: Iterable[pd.DataFrame]) -> pd.DataFrame
+        Transform the data by cleaning each chunk as it is read and wrangling them together.
     save_data(df: pd.DataFrame, fname: str) -> None
         Save the data to a CSV file.
     """
@@ -48,6 +61,8 @@ class PedestrianCountProcessor:
             "Harbour Esplanade - Bike Path": "Harbour Esplanade (West) - Bike Path",
             "Rmit Bld 80 - 445 Swanston Street": "Rmit Building 80" 
         }
+        # One alternation regex finds any of the area names in a single pass over a column name
+        self.location_pattern = re.compile("|".join(map(re.escape, self.location_mapping)))
 
         # These nominatim mapping rules below is needed because the Nominatim API cannot find the exact location of these areas
         self.nominatim_mapping_rules = {
@@ -98,7 +113,7 @@ class PedestrianCountProcessor:
         df.columns = (
             df.columns
               .str.replace("-", " - ", regex=False)  # Standardize the spelling of place names
-              .str.replace(r"\s+", " ", regex=True)  # Remove any extra spaces
+              .str.replace(WHITESPACE_PATTERN, " ", regex=True)  # Remove any extra spaces
               .str.strip()
               .str.title()
         )
@@ -120,11 +135,30 @@ class PedestrianCountProcessor:
             Standardized column names.
         """
 
-        for old_name, new_name in self.location_mapping.items():
-            if old_name in col:
-                return new_name
+        match = self.location_pattern.search(col)
+        if match:
+            return self.location_mapping[match.group(0)]
         return col
 
+    def _standardize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Standardize all column names with _standardize_column_names.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame to standardize the column names of.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with standardized column names.
+        """
+
+        df.columns = df.columns.map(self._standardize_column_names)
+
+        return df
+
     def _cast_column_types(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Cast the Date column to datetime with %d/%m/%Y format 
@@ -141,12 +175,15 @@ class PedestrianCountProcessor:
             DataFrame with column types cast to int.
         """
 
-        int_cols = [col for col in df.columns if col != 'Date']
-        df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y')
-        for col in int_cols:
-            df[col] = df[col].astype(int)
+        # Columns are cast by position, area names can repeat until _merge_duplicate_areas sums them
+        # The cast columns are put together in one step instead of being written back one at a time
+        columns = [
+            pd.to_datetime(df.iloc[:, i], format='%d/%m/%Y') if col == 'Date'
+            else df.iloc[:, i].astype(np.int32) # Hourly counts fit in int32 with half the memory of int64
+            for i, col in enumerate(df.columns)
+        ]
 
-        return df
+        return pd.concat(columns, axis=1)
 
     def _handle_null_values(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -164,12 +201,20 @@ class PedestrianCountProcessor:
         """
 
         df = df.dropna(subset=['Date'], axis=0) # Remove rows with null Date values
-        int_cols = [col for col in df.columns if col != 'Date']
-        for col in int_cols:
-            df[col] = df[col].replace(r'^(?!\d+\.?\d*$).*', 0, regex=True) # Replace non-numeric values with 0
-            df[col] = df[col].fillna(0)
-
-        return df
+        columns = []
+        for i, col in enumerate(df.columns):
+            if col == 'Date':
+                columns.append(df.iloc[:, i])
+                continue
+            # Copy so the input frame's buffer is never masked in place
+            values = pd.to_numeric(df.iloc[:, i], errors='coerce').to_numpy(copy=True)
+            # Only float columns can hold NaN, integer columns are kept as they are
+            if values.dtype.kind == 'f':
+                np.putmask(values, np.isnan(values), 0) # Replace non-numeric values with 0
+            columns.append(pd.Series(values, index=df.index, name=col))
+
+        # Build a new frame in one step instead of writing into the filtered slice
+        return pd.concat(columns, axis=1)
 
     def _add_missing_areas(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -187,11 +232,35 @@ class PedestrianCountProcessor:
         """
 
         missing_cols = sorted(set(self.cols_to_add) - set(df.columns))
-        for col in missing_cols:
-            df[col] = 0
+        if missing_cols:
+            # Append the missing areas as one zero block instead of inserting them one column at a time
+            zeros = pd.DataFrame(np.zeros((len(df), len(missing_cols)), dtype=np.int32), columns=missing_cols, index=df.index)
+            df = pd.concat([df, zeros], axis=1)
 
         return df
 
+    def _merge_duplicate_areas(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Sum the pedestrian count of columns that have the same name after mapping and sort the columns.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame to merge duplicate areas of.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with one column per area, sorted by name.
+        """
+
+        columns = {}
+        for i, col in enumerate(df.columns):
+            values = df.iloc[:, i].to_numpy()
+            columns[col] = columns[col] + values if col in columns else values
+
+        return pd.DataFrame({col: columns[col] for col in sorted(columns)}, index=df.index)
+
     def _get_season(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Get the season of each row based on the month.
@@ -207,19 +276,7 @@ class PedestrianCountProcessor:
             DataFrame with season added.
         """
 
-        df['season'] = np.where(
-            df['month'].isin([12, 1, 2]), 
-            'summer', 
-            np.where(
-                df['month'].isin([3, 4, 5]), 
-                'autumn', 
-                np.where(
-                    df['month'].isin([6, 7, 8]), 
-                    'winter', 
-                    'spring'
-                )
-            )
-        )
+        df['season'] = SEASONS_BY_MONTH[df['month'].to_numpy()]
 
         return df
 
@@ -239,8 +296,7 @@ class PedestrianCountProcessor:
         """
 
         # If the area contains more than 1 area name, only take the first one
-        match = re.split(r'[-(]', area, maxsplit=1)
-        extracted_area = match[0].strip()
+        extracted_area = area.split('-', 1)[0].split('(', 1)[0].strip()
         if extracted_area not in self.nominatim_mapping_rules:
             return extracted_area + ", Victoria, Australia"  # Take the first part and strip whitespace
         return self.nominatim_mapping_rules[extracted_area] + ", Victoria, Australia"  # Fallback: return the entire first area name if no match
@@ -248,7 +304,7 @@ class PedestrianCountProcessor:
     def clean(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Clean the DataFrame by:
-        - Removing null values.
+        - Removing rows with null Date values and replacing non-numeric pedestrian counts with 0.
         - Standardizing column names.
         - Casting column types.
         - Adding missing areas.
@@ -267,10 +323,10 @@ class PedestrianCountProcessor:
         
         df = self._clean_columns(df)
         df = self._handle_null_values(df)
-        df.columns = [self._standardize_column_names(col) for col in df.columns]
+        df = self._standardize_columns(df)
         df = self._cast_column_types(df)
         df = self._add_missing_areas(df)
-        df = df.groupby(level=0, axis=1).sum() # Merge columns with the same name after mapping
+        df = self._merge_duplicate_areas(df)
 
         return df
     
@@ -278,8 +334,8 @@ class PedestrianCountProcessor:
         """
         Wrangle the DataFrame by:
         - Adding datetime_AEST temporal feature column.
-        - Pivot the data from wide to long format.
-        - Add nominatim_area column for the Nominatim API latitude-longitude search.
+        - Pivot the data from wide to long format with area as a categorical column.
+        - Add nominatim_area categorical column for the Nominatim API latitude-longitude search.
 
         Parameters
         ----------
@@ -292,17 +348,25 @@ class PedestrianCountProcessor:
             Wrangled DataFrame.
         """
 
-        df['datetime_AEST'] = df['Date'].astype(str) + " " + df['Hour'].astype(str).str.zfill(2) + ":00:00"
-        df['datetime_AEST'] = pd.to_datetime(df['datetime_AEST'], format='%Y-%m-%d %H:%M:%S')
-        # Pivot the data into long format for easier visualization
-        df = pd.melt(
-            df.drop(columns=['Date', 'Hour'], axis=1),
-            id_vars=['datetime_AEST'],
-            var_name='area',
-            value_name='pedestrian_count'
-        )
-        df['nominatim_area'] = df["area"].apply(self._extract_area)
-        df['nominatim_area'] = df['nominatim_area'].str.strip().str.lower()
+        # Add the hours to the dates as timedelta64 arithmetic instead of formatting and parsing strings
+        datetimes = df['Date'] + pd.to_timedelta(df['Hour'].to_numpy(dtype=np.int64), unit='h')
+        # Pivot the data into long format for easier visualization. The column set is known, so
+        # the long arrays are built directly instead of going through melt: the datetimes are
+        # tiled once per area and the counts are read column by column from the 2D block
+        area_cols = [col for col in df.columns if col not in ('Date', 'Hour', 'datetime_AEST')]
+        # Area names repeat for every hour, so store them as category codes and
+        # extract each unique area once before gathering it back to the rows by code
+        categories = sorted(area_cols)
+        code_of = {area: i for i, area in enumerate(categories)}
+        codes = np.repeat(np.array([code_of[area] for area in area_cols], dtype=np.int32), len(df))
+        df = pd.DataFrame({
+            'datetime_AEST': np.tile(datetimes.to_numpy(), len(area_cols)),
+            'area': pd.Categorical.from_codes(codes, categories=categories),
+            'pedestrian_count': df[area_cols].to_numpy(dtype=np.int32).ravel(order='F'),
+        })
+        # Several areas share a Nominatim search name, which is also stored as category codes
+        nominatim_areas = pd.Categorical([self._extract_area(area).strip().lower() for area in categories])
+        df['nominatim_area'] = pd.Categorical.from_codes(nominatim_areas.codes[codes], categories=nominatim_areas.categories)
 
         return df
     
@@ -329,6 +393,35 @@ class PedestrianCountProcessor:
 
         return df
 
+    def transform_chunks(self, dfs: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Transform several raw DataFrames (e.g. one per monthly file) by cleaning each of them as it
+        arrives, so only one raw chunk is held in memory at a time, then wrangling them together.
+        The result is the same as transforming the concatenated raw DataFrames.
+
+        Parameters
+        ----------
+        dfs : Iterable[pd.DataFrame]
+            Raw DataFrames to transform, can be a generator.
+
+        Returns
+        -------
+        pd.DataFrame
+            Transformed DataFrame.
+        """
+
+        self.logger.info("Cleaning pedestrian count data...")
+        df = pd.concat((self.clean(chunk) for chunk in dfs), ignore_index=True)
+        # Areas that are missing from some of the chunks have no pedestrian count for those rows
+        area_cols = [col for col in df.columns if col != 'Date']
+        df[area_cols] = df[area_cols].fillna(0).astype(np.int32)
+        df = df.sort_index(axis=1) # Keep the same sorted column order as clean
+        self.logger.info("Wrangling pedestrian count data...")
+        df = self.wrangle(df)
+        self.logger.info("Processing pedestrian count data completed.")
+
+        return df
+
     def save_data(self, df: pd.DataFrame, fname: str) -> None:
         """
         Save the DataFrame to a CSV file.
@@ -1,12 +1,13 @@
-from pathlib import Path
+from datetime import date
+import logging
+import os
+from types import SimpleNamespace
 
+import numpy as np
 import pandas as pd
 
 import pytest
-from unittest.mock import patch, Mock
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from unittest.mock import patch, Mock, MagicMock
 
 from src.downloader import Downloader
 from src.air_quality import AirQualityProcessor
@@ -18,38 +19,46 @@ from src.area_mapping import AreaMapper
 @pytest.fixture
 def downloader(tmp_path):
     """Fixture to create a Downloader instance with temporary directory"""
-    with patch.object(Downloader, '__init__', lambda self: None):
-        dl = Downloader()
-        dl.data_dir = tmp_path / 'data'
-        dl.web_dir = tmp_path / 'web'
-        dl.air_quality_dir = dl.data_dir / 'air_quality'
-        dl.pedestrian_dir = dl.data_dir / 'pedestrian'
-        dl.air_quality_web_dir = dl.web_dir / 'data' / 'air_quality'
-        dl.pedestrian_web_dir = dl.web_dir / 'data' / 'pedestrian'
-        dl.logger = Mock()
-        
-        return dl
+    # Skip __init__ so no real HTTP session is created, the attributes are set below instead
+    dl = Downloader.__new__(Downloader)
+    dl.data_dir = tmp_path / 'data'
+    dl.web_dir = tmp_path / 'web'
+    dl.air_quality_dir = dl.data_dir / 'air_quality'
+    dl.pedestrian_dir = dl.data_dir / 'pedestrian'
+    dl.air_quality_web_dir = dl.web_dir / 'data' / 'air_quality'
+    dl.pedestrian_web_dir = dl.web_dir / 'data' / 'pedestrian'
+    dl.session = MagicMock()
+    dl.chunk_size = 1 << 20
+    dl.timeout = 30
+    dl.max_workers = 6
+    dl.logger = Mock(spec_set=logging.Logger)
+    
+    return dl
 
 
 @pytest.fixture
-def mock_urlretrieve():
-    """Fixture to mock urllib.request.urlretrieve"""
-    with patch('urllib.request.urlretrieve') as mock:
-        yield mock
+def mock_get(downloader):
+    """Fixture to mock the downloader session's get method with a successful streamed response"""
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {'ETag': '"abc123"'}
+    response.iter_content.return_value = [b'col1,col2\n', b'1,2\n']
+    downloader.session.get.return_value.__enter__.return_value = response
+    return downloader.session.get
 
 
 ### Air Quality Data Processing Fixtures ###
 @pytest.fixture
-def air_quality_processor():
+def air_quality_processor(tmp_path):
     """Fixture to create an AirQualityProcessor instance"""
-    proc = AirQualityProcessor()
-    proc.logger = Mock()
+    proc = AirQualityProcessor(cache_dir=tmp_path / '.cache')
+    proc.logger = Mock(spec_set=logging.Logger)
     return proc
 
 
-@pytest.fixture
-def sample_raw_data():
-    """Fixture to create sample raw air quality data"""
+@pytest.fixture(scope="session")
+def _sample_raw_data():
+    """Fixture to create sample raw air quality data, built once per test session"""
     return pd.DataFrame({
         'datetime_AEST': ['2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00'],
         'datetime_local': ['2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00'],
@@ -69,31 +78,29 @@ def sample_raw_data():
 
 
 @pytest.fixture
-def sample_raw_data_has_negative_values():
-    """Fixture to create sample raw air quality data"""
-    return pd.DataFrame({
-        'datetime_AEST': ['2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00'],
-        'datetime_local': ['2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00'],
-        'location_id': [1, 1, 1, 1, 1, 1, 1],
-        'location_name': ['Point Crook', 'Point Crook', 'Point Crook', 'Point Crook', 'Point Crook', 'Point Crook', 'Point Crook'],
-        'latitude': [-37.8136, -37.8136, -37.8136, -37.8136, -37.8136, -37.8136, -37.8136],
-        'longitude': [144.9631, 144.9631, 144.9631, 144.9631, 144.9631, 144.9631, 144.9631],
-        'parameter_name': ['CO', 'NO2', 'PM10', 'DBT', 'O3', 'PM2.5', 'SO2'],
-        'parameter_method_name': ['CO', 'NO2', 'PM10', 'DBT', 'O3', 'PM2.5', 'SO2'],
-        'parameter_description': ['Carbon Monoxide', 'Nitrogen Dioxide', 'Particulate Matter of 10 microns or less', 'Dry Bulb Temperature', 'Ozone', 'Particulate Matter of 2.5 microns or less', 'Sulfur Dioxide'],
-        'value': [-0.5, -15.0, -0.6, -19, -40, -8, -2],
-        'unit_of_measure': ['ppm', 'ppb', 'ug/m3', 'deg.C', 'ppb', 'ug/m3', 'ppb'],
-        'validation_flag': ['Y', 'Y', 'Y', 'Y', 'Y', 'Y', 'Y'],
-        'method_quality': ['Equivalence Method', 'Equivalence Method', 'Equivalence Method', 'Equivalence Method', 'Equivalence Method', 'Equivalence Method', 'Equivalence Method'],
-        'analysis_method_name': ['Analysis A', 'Analysis B', 'Analysis C', 'Analysis D', 'Analysis E', 'Analysis F', 'Analysis G']
-    })
+def sample_raw_data(_sample_raw_data):
+    """Fixture to create sample raw air quality data, copied so tests can modify it freely"""
+    return _sample_raw_data.copy()
+
+
+@pytest.fixture(scope="session")
+def _sample_raw_data_has_negative_values(_sample_raw_data):
+    """Fixture to create sample raw air quality data with negative measurements, built once per test session"""
+    # Only the measurement values differ from the sample raw data
+    return _sample_raw_data.assign(value=-_sample_raw_data['value'])
 
 
 @pytest.fixture
-def sample_clean_data():
-    """Fixture to create sample cleaned data"""
+def sample_raw_data_has_negative_values(_sample_raw_data_has_negative_values):
+    """Fixture to create sample raw air quality data with negative measurements, copied so tests can modify it freely"""
+    return _sample_raw_data_has_negative_values.copy()
+
+
+@pytest.fixture(scope="session")
+def _sample_clean_data():
+    """Fixture to create sample cleaned data, built once per test session"""
     return pd.DataFrame({
-        'datetime_AEST': pd.to_datetime(['2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00', '2022-01-01 01:00:00']),
+        'datetime_AEST': np.array(['2022-01-01T01:00:00'] * 7, dtype='datetime64[ns]'),
         'location_name': ['Point Crook', 'Point Crook', 'Point Crook', 'Point Crook', 'Point Crook', 'Point Crook', 'Point Crook'],
         'latitude': [-37.8136, -37.8136, -37.8136, -37.8136, -37.8136, -37.8136, -37.8136],
         'longitude': [144.9631, 144.9631, 144.9631, 144.9631, 144.9631, 144.9631, 144.9631],
@@ -106,13 +113,20 @@ def sample_clean_data():
         'SO2': [2.0, 1.5, 2.5, 2.0, 1.5, 2.5, 2.0]
     })
 
+
 @pytest.fixture
-def sample_wrangled_data():
-    """Fixture to create sample wrangled data"""
+def sample_clean_data(_sample_clean_data):
+    """Fixture to create sample cleaned data, copied so tests can modify it freely"""
+    return _sample_clean_data.copy()
+
+
+@pytest.fixture(scope="session")
+def _sample_wrangled_data():
+    """Fixture to create sample wrangled data, built once per test session"""
     return pd.DataFrame({
-        'datetime_AEST': pd.to_datetime(['2022-01-15 10:00:00', '2022-06-15 14:00:00', '2022-12-15 20:00:00']),
+        'datetime_AEST': np.array(['2022-01-15T10:00:00', '2022-06-15T14:00:00', '2022-12-15T20:00:00'], dtype='datetime64[ns]'),
         'month': [1, 6, 12],
-        'date': [pd.Timestamp('2022-01-15').date(), pd.Timestamp('2022-06-15').date(), pd.Timestamp('2022-12-15').date()],
+        'date': [date(2022, 1, 15), date(2022, 6, 15), date(2022, 12, 15)],
         'day': [15, 15, 15],
         'hour': [10, 14, 20],
         'season': ['summer', 'winter', 'summer'],
@@ -126,18 +140,29 @@ def sample_wrangled_data():
     })
 
 
-### Pedestrian Count Data Processing Fixtures ###
 @pytest.fixture
-def pedestrian_count_processor():
-    """Fixture to create a PedestrianCountProcessor instance"""
-    proc = PedestrianCountProcessor()
-    proc.logger = Mock()
-    return proc
+def sample_wrangled_data(_sample_wrangled_data):
+    """Fixture to create sample wrangled data, copied so tests can modify it freely"""
+    return _sample_wrangled_data.copy()
+
+
+### Pedestrian Count Data Processing Fixtures ###
+@pytest.fixture(scope="module")
+def _pedestrian_count_processor():
+    """Fixture to create a PedestrianCountProcessor instance once per test module"""
+    return PedestrianCountProcessor()
 
 
 @pytest.fixture
-def sample_raw_pedestrian_count_data():
-    """Fixture to create sample raw pedestrian count data"""
+def pedestrian_count_processor(_pedestrian_count_processor):
+    """Fixture to reuse the module PedestrianCountProcessor instance with a fresh logger"""
+    _pedestrian_count_processor.logger = Mock(spec_set=logging.Logger)
+    return _pedestrian_count_processor
+
+
+@pytest.fixture(scope="session")
+def _sample_raw_pedestrian_count_data():
+    """Fixture to create sample raw pedestrian count data, built once per test session"""
     return pd.DataFrame({
         'Date': ['01/01/2022', '01/01/2022'],
         'Hour': ['10', '11'],
@@ -152,10 +177,16 @@ def sample_raw_pedestrian_count_data():
 
 
 @pytest.fixture
-def sample_clean_pedestrian_count_data():
-    """Fixture to create sample clean pedestrian count data"""
+def sample_raw_pedestrian_count_data(_sample_raw_pedestrian_count_data):
+    """Fixture to create sample raw pedestrian count data, copied so tests can modify it freely"""
+    return _sample_raw_pedestrian_count_data.copy()
+
+
+@pytest.fixture(scope="session")
+def _sample_clean_pedestrian_count_data():
+    """Fixture to create sample clean pedestrian count data, built once per test session"""
     return pd.DataFrame({
-        'Date': pd.to_datetime(['01/01/2022', '01/01/2022'], format='%d/%m/%Y'),
+        'Date': np.array(['2022-01-01', '2022-01-01'], dtype='datetime64[ns]'),
         'Hour': [10, 11],
         'Melbourne Central': [100, 200],
         'Little Londsdale St (East)': [100, 200],
@@ -169,6 +200,12 @@ def sample_clean_pedestrian_count_data():
     })
 
 
+@pytest.fixture
+def sample_clean_pedestrian_count_data(_sample_clean_pedestrian_count_data):
+    """Fixture to create sample clean pedestrian count data, copied so tests can modify it freely"""
+    return _sample_clean_pedestrian_count_data.copy()
+
+
 ### Area Mapping Fixtures ###
 @pytest.fixture
 def mock_nominatim():
@@ -177,27 +214,40 @@ def mock_nominatim():
         yield mock
 
 
+@pytest.fixture(scope="module")
+def _mapper(tmp_path_factory):
+    """Fixture to create an AreaMapper instance once per test module"""
+    # save_dir is relative to the working directory, so __init__ runs inside a temporary directory
+    root = tmp_path_factory.mktemp("area_mapping")
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        with patch('src.area_mapping.Nominatim'):
+            mapper = AreaMapper()
+    finally:
+        os.chdir(cwd)
+    mapper.save_dir = root / mapper.save_dir
+    return mapper
+
+
 @pytest.fixture
-def mapper(tmp_path):
-    """Fixture to create an AreaMapper instance"""
-    with patch('src.area_mapping.Nominatim'):
-        mapper = AreaMapper()
-        mapper.logger = Mock()
-        mapper.save_dir = tmp_path / "area_mapping"
-        mapper.save_dir.mkdir(parents=True, exist_ok=True)
-        return mapper
+def mapper(_mapper):
+    """Fixture to reuse the module AreaMapper instance with a fresh logger and empty save directory"""
+    _mapper.logger = Mock(spec_set=logging.Logger)
+    for fname in [_mapper.area_coordinates_fname, _mapper.area_mapping_fname, _mapper.geocode_cache_fname]:
+        (_mapper.save_dir / fname).unlink(missing_ok=True)
+    return _mapper
 
 
 @pytest.fixture
 def mock_geocode_success():
     """Fixture for successful geocoding"""
-    mock_location = Mock()
-    mock_location.raw = {
+    # _find_area_coordinates adds query_area to the raw result, so each test gets its own dict
+    return SimpleNamespace(raw={
         "lat": "-37.8136",
         "lon": "144.9631",
         "display_name": "Melbourne CBD, Victoria, Australia"
-    }
-    return mock_location
+    })
 
 
 @pytest.fixture
@@ -206,20 +256,9 @@ def mock_geocode_failure():
     return None
 
 
-@pytest.fixture
-def mapper(tmp_path):
-    """Fixture to create an AreaMapper instance"""
-    with patch('src.area_mapping.Nominatim'):
-        mapper = AreaMapper()
-        mapper.logger = Mock()
-        mapper.save_dir = tmp_path / "area_mapping"
-        mapper.save_dir.mkdir(parents=True, exist_ok=True)
-        return mapper
-
-
-@pytest.fixture
-def sample_location_df():
-    """Fixture for sample location DataFrame"""
+@pytest.fixture(scope="session")
+def _sample_location_df():
+    """Fixture for sample location DataFrame, built once per session"""
     return pd.DataFrame({
         'nominatim_area': ['melbourne cbd', 'bourke street', 'federation square'],
         'pedestrian_count': [100, 200, 150]
@@ -227,8 +266,14 @@ def sample_location_df():
 
 
 @pytest.fixture
+def sample_location_df(_sample_location_df):
+    """Fixture for sample location DataFrame, copied since map_area_coordinates adds columns to it"""
+    return _sample_location_df.copy()
+
+
+@pytest.fixture(scope="session")
 def sample_location_mapping():
-    """Fixture for sample location mapping"""
+    """Fixture for sample location mapping, shared by every test since it is only read"""
     return [
         {
             "query_area": "melbourne cbd",
@@ -1,18 +1,12 @@
-from datetime import datetime
 from pathlib import Path
-import time
 
 import pytest
 import pandas as pd
 import numpy as np
 
-from unittest.mock import Mock, patch, call
+from unittest.mock import patch
 from pandas.testing import assert_frame_equal
 
-import sys
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.air_quality import AirQualityProcessor
 
 
@@ -47,8 +41,27 @@ class TestAirQualityProcessor:
         assert isinstance(proc.num_cols, list)
         assert len(proc.num_cols) == 9
 
+        assert proc.pollutant_cols == ['CO', 'DBT', 'NO2', 'O3', 'PM10', 'PM2.5', 'SO2']
+        assert isinstance(proc.pollutant_cols, list)
+        assert len(proc.pollutant_cols) == 7
+
+        assert proc.non_negative_cols == ['CO', 'NO2', 'O3', 'PM10', 'PM2.5', 'SO2']
+        assert proc.fill_diurnal_medians is False
+
+        assert proc.cache_dir == Path('data/.cache')
+        # The disk cache is only created when the imputer first runs
+        assert proc.memory is None
+
         assert proc.logger is not None
 
+
+    def test_init_does_not_create_cache_dir(self, tmp_path):
+        """Test that __init__ takes the cache directory without creating it"""
+        proc = AirQualityProcessor(cache_dir=tmp_path / '.cache')
+
+        assert proc.cache_dir == tmp_path / '.cache'
+        assert not proc.cache_dir.exists()
+
     ### End of test initialization ###
 
     
@@ -170,6 +183,14 @@ class TestAirQualityProcessor:
         with pytest.raises(Exception):
             air_quality_processor._cast_column_types(df)
 
+    def test_cast_column_types_skips_parsed_datetime(self, air_quality_processor, sample_clean_data):
+        """Test that an already parsed datetime column is not parsed again"""
+        with patch('src.air_quality.pd.to_datetime') as mock_to_datetime:
+            result = air_quality_processor._cast_column_types(sample_clean_data)
+
+        mock_to_datetime.assert_not_called()
+        assert pd.api.types.is_datetime64_any_dtype(result['datetime_AEST'])
+
     ### End of test _cast_column_types method ###
 
 
@@ -237,9 +258,91 @@ class TestAirQualityProcessor:
         # Should still produce a result (imputer should handle this)
         assert result is not None
 
+
+    def test_fill_null_values_reuses_cached_imputation(self, air_quality_processor):
+        """Test that imputing the same data twice reuses the cached result"""
+        df = pd.DataFrame({
+            'datetime_AEST': pd.to_datetime(['2022-01-01', '2022-01-02', '2022-01-03']),
+            'latitude': [-37.8136, -37.8136, -37.8136],
+            'longitude': [144.9631, 144.9631, 144.9631],
+            'CO': [0.5, np.nan, 0.6],
+            'DBT': [25.0, 26.0, 27.0],
+            'NO2': [15.0, 16.0, np.nan],
+            'O3': [40.0, 41.0, 42.0],
+            'PM10': [20.0, 21.0, 22.0],
+            'PM2.5': [8.0, 9.0, 10.0],
+            'SO2': [2.0, 2.1, 2.2]
+        })
+
+        first = air_quality_processor._fill_null_valuse(df.copy())
+        with patch('src.air_quality.IterativeImputer') as mock_imputer:
+            second = air_quality_processor._fill_null_valuse(df.copy())
+
+        mock_imputer.assert_not_called()
+        assert_frame_equal(first, second)
+        assert air_quality_processor.cache_dir.exists()
+
+    def test_fill_null_values_skips_imputer_without_nulls(self, air_quality_processor):
+        """Test that the imputer is not fitted when there is nothing to fill"""
+        df = pd.DataFrame({
+            'datetime_AEST': pd.to_datetime(['2022-01-01', '2022-01-02']),
+            'latitude': [-37.8136, -37.8136],
+            'longitude': [144.9631, 144.9631],
+            'CO': [0.5, 0.6],
+            'DBT': [25.0, 26.0],
+            'NO2': [15.0, 16.0],
+            'O3': [40.0, 41.0],
+            'PM10': [20.0, 21.0],
+            'PM2.5': [8.0, 9.0],
+            'SO2': [2.0, 2.1]
+        })
+        
+        with patch('src.air_quality.IterativeImputer') as mock_imputer:
+            air_quality_processor._fill_null_valuse(df)
+        
+        mock_imputer.assert_not_called()
+
     ### End of test _fill_null_values method ###
 
 
+    ### Test _fill_diurnal_medians method ###
+    def test_fill_diurnal_medians_uses_location_and_hour(self, air_quality_processor):
+        """Test that nulls are filled with the median of the same location and hour"""
+        df = pd.DataFrame({
+            'datetime_AEST': pd.to_datetime(['2022-01-01 01:00', '2022-01-02 01:00', '2022-01-03 01:00',
+                                             '2022-01-03 02:00', '2022-01-03 01:00']),
+            'location_name': ['A', 'A', 'A', 'A', 'B'],
+            'latitude': [-37.8, np.nan, -37.8, -37.8, -38.0],
+            'longitude': [144.9, 144.9, 144.9, np.nan, 145.0],
+            'CO': [0.5, 0.7, np.nan, 9.0, 5.0],
+            'DBT': [25.0, 26.0, 27.0, 28.0, 29.0],
+            'NO2': [15.0, 16.0, 17.0, 18.0, np.nan],
+            'O3': [40.0, 41.0, 42.0, 43.0, 44.0],
+            'PM10': [20.0, 21.0, 22.0, 23.0, 24.0],
+            'PM2.5': [8.0, 9.0, 10.0, 11.0, 12.0],
+            'SO2': [2.0, 2.1, 2.2, 2.3, 2.4]
+        })
+        
+        result = air_quality_processor._fill_diurnal_medians(df)
+        
+        assert result.loc[1, 'latitude'] == -37.8
+        assert result.loc[3, 'longitude'] == 144.9
+        assert result.loc[2, 'CO'] == pytest.approx(0.6)
+        # Location B has no other NO2 readings at that hour, so it is left for the imputer
+        assert pd.isna(result.loc[4, 'NO2'])
+
+    @pytest.mark.parametrize("fill_diurnal_medians", [False, True])
+    def test_clean_fills_diurnal_medians_only_when_enabled(self, air_quality_processor, sample_raw_data, fill_diurnal_medians):
+        """Test that clean only runs the diurnal median pre-fill when it is opted into"""
+        air_quality_processor.fill_diurnal_medians = fill_diurnal_medians
+        with patch.object(air_quality_processor, '_fill_diurnal_medians', wraps=air_quality_processor._fill_diurnal_medians) as mock_fill:
+            air_quality_processor.clean(sample_raw_data)
+
+        assert mock_fill.called == fill_diurnal_medians
+
+    ### End of test _fill_diurnal_medians method ###
+
+
     ### Test _get_season method
     def test_get_season_months(self, air_quality_processor):
         """Test that seasons are correctly identified"""
@@ -257,11 +360,9 @@ class TestAirQualityProcessor:
     ### Test clean method ###
     def test_clean_removes_excluded_measurements(self, air_quality_processor, sample_raw_data):
         """Test that excluded measurements are removed"""
-        # Add an excluded measurement
-        excluded_data = sample_raw_data.copy()
-        excluded_row = excluded_data.iloc[0].copy()
-        excluded_row['parameter_name'] = 'BSP'
-        excluded_data = pd.concat([excluded_data, excluded_row.to_frame().T], ignore_index=True)
+        # Add an excluded measurement, slicing a one-row frame keeps the column dtypes unlike a transposed Series
+        excluded_row = sample_raw_data.iloc[[0]].assign(parameter_name='BSP')
+        excluded_data = pd.concat([sample_raw_data, excluded_row], ignore_index=True)
         
         result = air_quality_processor.clean(excluded_data)
         
@@ -278,6 +379,16 @@ class TestAirQualityProcessor:
             assert col not in result.columns
 
 
+    def test_clean_handles_already_dropped_columns(self, air_quality_processor, sample_raw_data):
+        """Test that clean works when unused columns were skipped at read time"""
+        projected = sample_raw_data.drop(columns=air_quality_processor.cols_to_drop)
+        
+        result = air_quality_processor.clean(projected)
+        expected = air_quality_processor.clean(sample_raw_data)
+        
+        assert_frame_equal(result, expected)
+
+
     def test_clean_pivots_data_correctly(self, air_quality_processor, sample_raw_data):
         """Test that data is pivoted correctly"""
         result = air_quality_processor.clean(sample_raw_data)
@@ -303,6 +414,15 @@ class TestAirQualityProcessor:
         assert result['SO2'].iloc[0] == 0
 
 
+    def test_clean_keeps_measurements_in_double_precision(self, air_quality_processor, sample_raw_data):
+        """Test that measurement columns stay float64, so the published medians are not rounded to float32"""
+        result = air_quality_processor.clean(sample_raw_data)
+        
+        for col in air_quality_processor.pollutant_cols:
+            assert result[col].dtype == np.float64
+        assert isinstance(result['location_name'].dtype, pd.CategoricalDtype)
+
+
     def test_clean_with_empty_dataframe(self, air_quality_processor):
         """Test clean with empty dataframe"""
         df = pd.DataFrame(columns=[
@@ -367,6 +487,20 @@ class TestAirQualityProcessor:
         assert_frame_equal(result[['hour']], expected_result)
 
 
+    def test_wrangle_matches_datetime_accessors(self, air_quality_processor):
+        """Test that the derived features match the pandas datetime accessors"""
+        timestamps = pd.Series(pd.to_datetime(['2021-12-31 23:00:00', '2022-02-28 00:00:00', '2022-03-01 13:00:00', '2022-12-31 23:00:00']))
+        df = pd.DataFrame({'datetime_AEST': timestamps})
+        
+        result = air_quality_processor.wrangle(df)
+        
+        assert list(result['month']) == list(timestamps.dt.month)
+        assert list(result['day']) == list(timestamps.dt.day)
+        assert list(result['hour']) == list(timestamps.dt.hour)
+        assert list(result['date'].dt.date) == list(timestamps.dt.date)
+        assert list(result['season']) == ['summer', 'summer', 'autumn', 'summer']
+
+
     def test_wrangle_correct_season_assignment(self, air_quality_processor, sample_clean_data):
         """Test that seasons are assigned correctly"""
         result = air_quality_processor.wrangle(sample_clean_data)
@@ -461,6 +595,16 @@ class TestAirQualityProcessor:
         # Should aggregate to single row
         assert len(result) == 1
 
+    def test_aggregate_keeps_time_features_and_order(self, air_quality_processor, sample_wrangled_data):
+        """Test that time features follow their datetime and rows are sorted by datetime"""
+        shuffled = sample_wrangled_data.iloc[[2, 0, 1]].reset_index(drop=True)
+        
+        result = air_quality_processor.aggregate(shuffled)
+        
+        assert list(result.columns) == ["datetime_AEST", "month", "date", "day", "hour", "season",
+                                        "CO", "DBT", "NO2", "O3", "PM10", "PM2.5", "SO2"]
+        assert_frame_equal(result[sample_wrangled_data.columns], sample_wrangled_data)
+
     ### End of test aggregate method ###
 
     ### Test transform method ###
@@ -554,14 +698,11 @@ class TestAirQualityProcessor:
         
         # Create initial file
         air_quality_processor.save_data(sample_wrangled_data, file_path)
-        initial_mtime = file_path.stat().st_mtime
         
-        # Adds a delay before saving again
-        time.sleep(0.1)
-        air_quality_processor.save_data(sample_wrangled_data, file_path)
-        new_mtime = file_path.stat().st_mtime
+        # Save fewer rows over it, the file should hold only the new rows
+        air_quality_processor.save_data(sample_wrangled_data.head(1), file_path)
         
-        assert new_mtime > initial_mtime
+        assert len(pd.read_csv(file_path)) == 1
 
     ### End of test save_data method ###
 
@@ -1,29 +1,30 @@
-from datetime import datetime
 import json
 from pathlib import Path
-import time
 
 import pytest
 import pandas as pd
-import numpy as np
 
-from unittest.mock import Mock, patch, call
+from unittest.mock import Mock, patch
 from pandas.testing import assert_frame_equal
 
-import sys
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.area_mapping import AreaMapper
 
 
+_MSG_DIR_EXISTS = "Area mapping directory {} exists."
+_MSG_DIR_CREATING = "Area mapping directory {} does not exist. Creating..."
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """Turn time.sleep into a no-op so no test in this module waits on the API rate limit"""
+    monkeypatch.setattr('time.sleep', lambda *_: None)
+
+
 class TestAreaMapperInit:
     """Test suite for the AreaMapper.__init__ method"""
 
-    def test_init_creates_instance(self, mock_nominatim):
+    def test_init_creates_instance(self, mapper):
         """Test that __init__ creates a valid instance"""
-        mapper = AreaMapper()
-        
         assert mapper is not None
         assert isinstance(mapper, AreaMapper)
 
@@ -36,35 +37,28 @@ class TestAreaMapperInit:
         mock_nominatim.assert_called_with(user_agent="AreaMapper")
 
 
-    def test_init_sets_save_dir(self, mock_nominatim):
-        """Test that save_dir is set correctly"""
-        mapper = AreaMapper()
-        
-        assert hasattr(mapper, 'save_dir')
-        assert isinstance(mapper.save_dir, Path)
-        assert mapper.save_dir == Path("data/area_mapping")
+    @pytest.mark.parametrize(
+        "attr, expected",
+        [
+            ("area_coordinates_fname", "area_coordinates.json"),
+            ("area_mapping_fname", "area_mapping.csv"),
+            ("geocode_cache_fname", "geocode_cache.json")
+        ]
+    )
+    def test_init_sets_attributes(self, mapper, attr, expected):
+        """Test that the file names are set correctly"""
+        assert getattr(mapper, attr) == expected
 
 
-    def test_init_sets_logger(self, mock_nominatim):
+    def test_init_sets_logger(self, mapper):
         """Test that logger is initialized"""
-        mapper = AreaMapper()
-        
         assert hasattr(mapper, 'logger')
         assert mapper.logger is not None
 
 
-    def test_init_sets_area_coordinates_fname(self, mock_nominatim):
-        """Test that area_coordinates_fname is set"""
-        mapper = AreaMapper()
-        
-        assert mapper.area_coordinates_fname == 'area_coordinates.json'
-
-
-    def test_init_sets_area_mapping_fname(self, mock_nominatim):
-        """Test that area_mapping_fname is set"""
-        mapper = AreaMapper()
-        
-        assert mapper.area_mapping_fname == 'area_mapping.csv'
+    def test_init_sets_request_interval(self, mapper):
+        """Test that request_interval respects the Nominatim rate limit"""
+        assert mapper.request_interval >= 1
 
 
     def test_init_creates_directory_if_not_exists(self, mock_nominatim, tmp_path):
@@ -84,56 +78,47 @@ class TestAreaMapperInit:
             assert mapper.save_dir.exists()
 
 
-    def test_init_logs_when_directory_exists(self, mock_nominatim, tmp_path):
-        """Test that init logs when directory exists"""
-        # Create directory first
-        test_dir = tmp_path / "area_mapping"
-        test_dir.mkdir(parents=True, exist_ok=True)
+    @pytest.mark.parametrize(
+        "dir_exists, message",
+        [
+            (True, _MSG_DIR_EXISTS),
+            (False, _MSG_DIR_CREATING)
+        ]
+    )
+    def test_init_logs_directory_status(self, mock_nominatim, tmp_path, monkeypatch, dir_exists, message):
+        """Test that init logs whether save_dir exists or is being created"""
+        # save_dir is relative to the working directory, so run __init__ inside tmp_path
+        monkeypatch.chdir(tmp_path)
+        save_dir = Path("data/area_mapping")
+        if dir_exists:
+            save_dir.mkdir(parents=True)
         
-        with patch('src.area_mapping.AreaMapper.__init__', lambda self: None):
+        with patch('src.area_mapping.logging.getLogger') as mock_get_logger:
             mapper = AreaMapper()
-            mapper.save_dir = test_dir
-            mapper.logger = Mock()
-            
-            # Manually test the directory existence logic
-            if mapper.save_dir.exists():
-                mapper.logger.info(f"Area mapping directory {mapper.save_dir} exists.")
-            
-            # Verify logging was called
-            mapper.logger.info.assert_called_with(f"Area mapping directory {test_dir} exists.")
-
-
-    def test_init_logs_when_creating_directory(self, mock_nominatim, tmp_path):
-        """Test that init logs when creating directory"""
-        test_dir = tmp_path / "new_area_mapping"
         
-        with patch('src.area_mapping.AreaMapper.__init__', lambda self: None):
-            mapper = AreaMapper()
-            mapper.save_dir = test_dir
-            mapper.logger = Mock()
-            
-            # Manually test the directory creation logic
-            if not mapper.save_dir.exists():
-                mapper.logger.info(f"Area mapping directory {mapper.save_dir} does not exist. Creating...")
-                mapper.save_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Verify logging was called and directory was created
-            mapper.logger.info.assert_called_with(f"Area mapping directory {test_dir} does not exist. Creating...")
-            assert mapper.save_dir.exists()
+        mock_get_logger.return_value.info.assert_called_once_with(message.format(save_dir))
+        assert mapper.save_dir == save_dir
+        assert save_dir.exists()
 
 
 class TestAreaMapperFindAreaCoordinates:
     """Test suite for the AreaMapper._find_area_coordinates method"""
 
-    def test_find_area_coordinates_returns_list(self, mapper):
+    @pytest.fixture(autouse=True)
+    def mock_nom(self, monkeypatch):
+        """Fixture to patch Nominatim once for every test in this class"""
+        mock = Mock()
+        monkeypatch.setattr('src.area_mapping.Nominatim', mock)
+        return mock
+
+
+    def test_find_area_coordinates_returns_list(self, mapper, mock_nom):
         """Test that method returns a list"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, \
-             patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = None
-            
-            result = mapper._find_area_coordinates(["Test Area"])
-            
-            assert isinstance(result, list)
+        mock_nom.return_value.geocode.return_value = None
+        
+        result = mapper._find_area_coordinates(["Test Area"])
+        
+        assert isinstance(result, list)
 
 
     def test_find_area_coordinates_empty_list(self, mapper):
@@ -143,156 +128,184 @@ class TestAreaMapperFindAreaCoordinates:
         assert result == []
 
 
-    def test_find_area_coordinates_single_area_success(self, mapper, mock_geocode_success):
+    def test_find_area_coordinates_single_area_success(self, mapper, mock_nom, mock_geocode_success):
         """Test geocoding single area successfully"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = mock_geocode_success
-            
-            result = mapper._find_area_coordinates(["Melbourne CBD"])
-            
-            assert len(result) == 1
-            assert isinstance(result[0], dict)
-            assert "query_area" in result[0]
-            assert result[0]["query_area"] == "Melbourne CBD"
+        mock_nom.return_value.geocode.return_value = mock_geocode_success
+        
+        result = mapper._find_area_coordinates(["Melbourne CBD"])
+        
+        assert len(result) == 1
+        assert isinstance(result[0], dict)
+        assert "query_area" in result[0]
+        assert result[0]["query_area"] == "Melbourne CBD"
 
 
-    def test_find_area_coordinates_single_area_failure(self, mapper):
+    def test_find_area_coordinates_single_area_failure(self, mapper, mock_nom):
         """Test geocoding single area that fails"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = None
-            
-            result = mapper._find_area_coordinates(["Unknown Location"])
-            
-            assert len(result) == 1
-            assert result[0] == []
+        mock_nom.return_value.geocode.return_value = None
+        
+        result = mapper._find_area_coordinates(["Unknown Location"])
+        
+        assert len(result) == 1
+        assert result[0] == []
 
 
-    def test_find_area_coordinates_multiple_areas(self, mapper, mock_geocode_success):
+    def test_find_area_coordinates_multiple_areas(self, mapper, mock_nom, mock_geocode_success):
         """Test geocoding multiple areas"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = mock_geocode_success
-            
-            areas = ["Melbourne CBD", "Bourke Street", "Federation Square"]
-            result = mapper._find_area_coordinates(areas)
-            
-            assert len(result) == 3
+        mock_nom.return_value.geocode.return_value = mock_geocode_success
+        
+        areas = ["Melbourne CBD", "Bourke Street", "Federation Square"]
+        result = mapper._find_area_coordinates(areas)
+        
+        assert len(result) == 3
 
 
-    def test_find_area_coordinates_mixed_success_failure(self, mapper):
+    def test_find_area_coordinates_mixed_success_failure(self, mapper, mock_nom):
         """Test geocoding with mix of successful and failed lookups"""
         mock_location = Mock()
         mock_location.raw = {"lat": "-37.8136", "lon": "144.9631"}
         
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            # First succeeds, second fails, third succeeds
-            mock_nom.return_value.geocode.side_effect = [
-                mock_location,
-                None,
-                mock_location
-            ]
-            
-            result = mapper._find_area_coordinates(["Area1", "Area2", "Area3"])
-            
-            assert len(result) == 3
-            assert isinstance(result[0], dict)
-            assert result[1] == []
-            assert isinstance(result[2], dict)
+        # First succeeds, second fails, third succeeds
+        mock_nom.return_value.geocode.side_effect = [
+            mock_location,
+            None,
+            mock_location
+        ]
+        
+        result = mapper._find_area_coordinates(["Area1", "Area2", "Area3"])
+        
+        assert len(result) == 3
+        assert isinstance(result[0], dict)
+        assert result[1] == []
+        assert isinstance(result[2], dict)
 
 
-    def test_find_area_coordinates_adds_query_area(self, mapper):
+    def test_find_area_coordinates_adds_query_area(self, mapper, mock_nom):
         """Test that query_area is added to result"""
         mock_location = Mock()
         mock_location.raw = {"lat": "-37.8136", "lon": "144.9631"}
         
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = mock_location
-            
-            result = mapper._find_area_coordinates(["Test Area"])
-            
-            assert "query_area" in result[0]
-            assert result[0]["query_area"] == "Test Area"
+        mock_nom.return_value.geocode.return_value = mock_location
+        
+        result = mapper._find_area_coordinates(["Test Area"])
+        
+        assert "query_area" in result[0]
+        assert result[0]["query_area"] == "Test Area"
 
 
-    def test_find_area_coordinates_sleeps_between_calls(self, mapper):
+    def test_find_area_coordinates_sleeps_between_calls(self, mapper, mock_nom):
         """Test that method sleeps between API calls"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep') as mock_sleep:
+        with patch('time.sleep') as mock_sleep:
             mock_nom.return_value.geocode.return_value = None
             
             mapper._find_area_coordinates(["Area1", "Area2", "Area3"])
             
-            # Should sleep 3 times (once per area)
-            assert mock_sleep.call_count == 3
-            mock_sleep.assert_called_with(5)
-
-
-    def test_find_area_coordinates_logs_progress(self, mapper):
-        """Test that method logs progress"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = None
-            
-            mapper._find_area_coordinates(["Test Area"])
-            
-            # Check that logger was called
-            assert mapper.logger.info.called
+            # Should sleep 2 times (between consecutive requests)
+            assert mock_sleep.call_count == 2
+            for sleep_call in mock_sleep.call_args_list:
+                assert 0 < sleep_call[0][0] <= mapper.request_interval
 
 
-    def test_find_area_coordinates_logs_warnings_on_failure(self, mapper):
-        """Test that method logs warnings when geocoding fails"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
+    def test_find_area_coordinates_skips_sleep_after_slow_request(self, mapper, mock_nom):
+        """Test that no extra sleep happens when a request already took the whole interval"""
+        with patch('time.sleep') as mock_sleep, \
+             patch('time.monotonic', side_effect=[0.0, 5.0, 5.0]):
             mock_nom.return_value.geocode.return_value = None
             
-            mapper._find_area_coordinates(["Unknown Area"])
+            mapper._find_area_coordinates(["Area1", "Area2"])
             
-            # Should log warning
-            assert mapper.logger.warning.called
-
-
-    def test_find_area_coordinates_uses_correct_user_agent(self, mapper):
+            mock_sleep.assert_not_called()
+
+
+    @pytest.mark.parametrize(
+        "method, cached, info_messages, warning",
+        [
+            # A failed lookup is queried, warned about, and still saved
+            (
+                "_find_area_coordinates", False,
+                ["Creating location mapping for each pedestrian area...", "Querying Unknown Area...",
+                 "Location mapping saved to {coordinates_file}"],
+                "Unknown Area can't be queried, appending empty list instead..."
+            ),
+            # A cached area is not queried again
+            (
+                "_find_area_coordinates", True,
+                ["Creating location mapping for each pedestrian area...", "Found cached coordinates for Unknown Area.",
+                 "Location mapping saved to {coordinates_file}"],
+                None
+            ),
+            # map_area_coordinates logs its own progress around the lookup
+            (
+                "map_area_coordinates", False,
+                ["Creating area to coordinates mapping...", "Querying Unknown Area...",
+                 "Area coordinates mapping saved to {mapping_file}"],
+                "Unknown Area can't be queried, appending empty list instead..."
+            ),
+        ],
+        ids=["failed_lookup", "cached_lookup", "map_area_coordinates"]
+    )
+    def test_logs_each_code_path(self, mapper, mock_nom, mock_geocode_success, method, cached, info_messages, warning):
+        """Test that each code path logs its progress, and a warning only when geocoding fails"""
+        if cached:
+            mapper._save_geocode_cache({"unknown area": mock_geocode_success.raw})
+        mock_nom.return_value.geocode.return_value = None
+        arg = ["Unknown Area"] if method == "_find_area_coordinates" else pd.DataFrame({'nominatim_area': ["Unknown Area"]})
+        
+        getattr(mapper, method)(arg)
+        
+        for message in info_messages:
+            mapper.logger.info.assert_any_call(message.format(
+                coordinates_file=mapper.save_dir/mapper.area_coordinates_fname,
+                mapping_file=mapper.save_dir/mapper.area_mapping_fname
+            ))
+        if warning is None:
+            mapper.logger.warning.assert_not_called()
+        else:
+            mapper.logger.warning.assert_called_once_with(warning)
+
+
+    def test_find_area_coordinates_uses_correct_user_agent(self, mapper, mock_nom):
         """Test that Nominatim is initialized with correct user agent"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = None
-            
-            mapper._find_area_coordinates(["Test"])
-            
-            # Should create Nominatim with "tutorial" user agent
-            mock_nom.assert_called_with(user_agent="tutorial")
+        mock_nom.return_value.geocode.return_value = None
+        
+        mapper._find_area_coordinates(["Test"])
+        
+        # Should create Nominatim with "tutorial" user agent
+        mock_nom.assert_called_with(user_agent="tutorial")
 
 
-    def test_find_area_coordinates_uses_country_code(self, mapper):
+    def test_find_area_coordinates_uses_country_code(self, mapper, mock_nom):
         """Test that geocode uses country_codes parameter"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_geocode = Mock()
-            mock_nom.return_value.geocode = mock_geocode
-            mock_geocode.return_value = None
-            
-            mapper._find_area_coordinates(["Melbourne"])
-            
-            # Should call geocode with country_codes="au"
-            mock_geocode.assert_called_with(query="Melbourne", country_codes="au")
+        mock_geocode = Mock()
+        mock_nom.return_value.geocode = mock_geocode
+        mock_geocode.return_value = None
+        
+        mapper._find_area_coordinates(["Melbourne"])
+        
+        # Should call geocode with country_codes="au"
+        mock_geocode.assert_called_with(query="Melbourne", country_codes="au")
 
 
-    def test_find_area_coordinates_handles_special_characters(self, mapper):
+    def test_find_area_coordinates_handles_special_characters(self, mapper, mock_nom):
         """Test handling areas with special characters"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = None
-            
-            areas = ["St Kilda's Beach", "Queen's Park", "O'Connell St"]
-            result = mapper._find_area_coordinates(areas)
-            
-            assert len(result) == 3
+        mock_nom.return_value.geocode.return_value = None
+        
+        areas = ["St Kilda's Beach", "Queen's Park", "O'Connell St"]
+        result = mapper._find_area_coordinates(areas)
+        
+        assert len(result) == 3
 
 
-    def test_find_area_coordinates_handles_unicode(self, mapper):
+    def test_find_area_coordinates_handles_unicode(self, mapper, mock_nom):
         """Test handling areas with unicode characters"""
-        with patch('src.area_mapping.Nominatim') as mock_nom, patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = None
-            
-            result = mapper._find_area_coordinates(["Café Street"])
-            
-            assert len(result) == 1
+        mock_nom.return_value.geocode.return_value = None
+        
+        result = mapper._find_area_coordinates(["Café Street"])
+        
+        assert len(result) == 1
 
 
-    def test_find_area_coordinates_preserves_raw_data(self, mapper):
+    def test_find_area_coordinates_preserves_raw_data(self, mapper, mock_nom):
         """Test that raw geocoding data is preserved"""
         mock_location = Mock()
         mock_location.raw = {
@@ -302,29 +315,71 @@ class TestAreaMapperFindAreaCoordinates:
             "extra_field": "extra_value"
         }
         
-        with patch('src.area_mapping.Nominatim') as mock_nom, \
-             patch('time.sleep'):
-            mock_nom.return_value.geocode.return_value = mock_location
-            
-            result = mapper._find_area_coordinates(["Test"])
-            
-            assert "extra_field" in result[0]
-            assert result[0]["extra_field"] == "extra_value"
+        mock_nom.return_value.geocode.return_value = mock_location
+        
+        result = mapper._find_area_coordinates(["Test"])
+        
+        assert "extra_field" in result[0]
+        assert result[0]["extra_field"] == "extra_value"
 
 
-    def test_find_area_coordinates_api_rate_limiting(self, mapper):
-        """Test that 5 second delay prevents API rate limiting"""
-        start_time = time.time()
-        
-        with patch('src.area_mapping.Nominatim') as mock_nom, \
-             patch('time.sleep', wraps=time.sleep) as mock_sleep:
-            
+    def test_find_area_coordinates_api_rate_limiting(self, mapper, mock_nom):
+        """Test that the request interval delay prevents API rate limiting"""
+        with patch('time.sleep') as mock_sleep, \
+             patch('time.monotonic', side_effect=[0.0, 0.1, 0.1]):
             mock_nom.return_value.geocode.return_value = None
             mapper._find_area_coordinates(["Area1", "Area2"])
             
-            # Should have called sleep twice
-            assert mock_sleep.call_count == 2
-            mock_sleep.assert_called_with(5)
+            # Should have called sleep once, between the two requests, for the rest of the interval
+            assert mock_sleep.call_count == 1
+            assert mock_sleep.call_args[0][0] == pytest.approx(mapper.request_interval - 0.1)
+
+
+    def test_find_area_coordinates_saves_location_mapping(self, mapper, mock_nom, mock_geocode_success):
+        """Test that the location mapping is saved to the area coordinates file"""
+        mock_nom.return_value.geocode.return_value = mock_geocode_success
+
+        result = mapper._find_area_coordinates(["Melbourne CBD"])
+
+        with open(mapper.save_dir / mapper.area_coordinates_fname, "r") as f:
+            assert json.load(f) == result
+
+
+    def test_find_area_coordinates_uses_geocode_cache(self, mapper, mock_nom, mock_geocode_success):
+        """Test that cached areas are not queried again"""
+        mock_nom.return_value.geocode.return_value = mock_geocode_success
+        first = mapper._find_area_coordinates(["Melbourne CBD"])
+
+        mock_nom.reset_mock()
+        mock_nom.return_value.geocode.return_value = None
+        second = mapper._find_area_coordinates(["  melbourne cbd", "Bourke Street"])
+
+        # Only the uncached area should hit the API
+        assert mock_nom.return_value.geocode.call_count == 1
+
+        assert second[0]["lat"] == first[0]["lat"]
+        assert second[0]["query_area"] == "  melbourne cbd"
+
+
+    def test_find_area_coordinates_does_not_cache_failures(self, mapper, mock_nom):
+        """Test that failed lookups are retried on the next run"""
+        mock_nom.return_value.geocode.return_value = None
+        mapper._find_area_coordinates(["Unknown Area"])
+        mapper._find_area_coordinates(["Unknown Area"])
+
+        assert mock_nom.return_value.geocode.call_count == 2
+
+
+    def test_find_area_coordinates_seeds_cache_from_area_coordinates_file(self, mapper, mock_nom, mock_geocode_success):
+        """Test that an area coordinates file from an earlier run is reused, except for its failed lookups"""
+        with open(mapper.save_dir / mapper.area_coordinates_fname, "w") as f:
+            json.dump([{"query_area": "Melbourne CBD", "lat": "-37.8136", "lon": "144.9631"}, []], f)
+        mock_nom.return_value.geocode.return_value = mock_geocode_success
+
+        result = mapper._find_area_coordinates(["Melbourne CBD", "Unknown Area"])
+
+        mock_nom.return_value.geocode.assert_called_once_with(query="Unknown Area", country_codes="au")
+        assert result[0]["lat"] == "-37.8136"
 
 
 class TestAreaMapperMapAreaCoordinates:
@@ -337,19 +392,13 @@ class TestAreaMapperMapAreaCoordinates:
             
             assert isinstance(result, pd.DataFrame)
 
-    def test_map_area_coordinates_adds_latitude_column(self, mapper, sample_location_df, sample_location_mapping):
-        """Test that latitude column is added"""
+    @pytest.mark.parametrize("col", ["latitude", "longitude"])
+    def test_map_area_coordinates_adds_coordinate_column(self, mapper, sample_location_df, sample_location_mapping, col):
+        """Test that latitude and longitude columns are added"""
         with patch.object(mapper, '_find_area_coordinates', return_value=sample_location_mapping):
             result = mapper.map_area_coordinates(sample_location_df)
             
-            assert 'latitude' in result.columns
-
-    def test_map_area_coordinates_adds_longitude_column(self, mapper, sample_location_df, sample_location_mapping):
-        """Test that longitude column is added"""
-        with patch.object(mapper, '_find_area_coordinates', return_value=sample_location_mapping):
-            result = mapper.map_area_coordinates(sample_location_df)
-            
-            assert 'longitude' in result.columns
+            assert col in result.columns
 
     def test_map_area_coordinates_correct_values(self, mapper, sample_location_df, sample_location_mapping):
         """Test that coordinates are mapped correctly"""
@@ -359,18 +408,18 @@ class TestAreaMapperMapAreaCoordinates:
             assert result.loc[0, 'latitude'] == "-37.8136"
             assert result.loc[0, 'longitude'] == "144.9631"
 
-    def test_map_area_coordinates_loads_existing_file(self, mapper, sample_location_df, sample_location_mapping):
-        """Test that existing coordinates file is loaded"""
+    def test_map_area_coordinates_ignores_existing_file(self, mapper, sample_location_df, sample_location_mapping):
+        """Test that an existing coordinates file does not skip the lookup of new or failed areas"""
         # Create existing file
         coords_file = mapper.save_dir / mapper.area_coordinates_fname
         with open(coords_file, 'w') as f:
             json.dump(sample_location_mapping, f)
         
-        with patch.object(mapper, '_find_area_coordinates') as mock_find:
+        with patch.object(mapper, '_find_area_coordinates', return_value=sample_location_mapping) as mock_find:
             result = mapper.map_area_coordinates(sample_location_df)
             
-            # Should not call _find_area_coordinates
-            mock_find.assert_not_called()
+            # Should go through _find_area_coordinates and its per-area cache
+            mock_find.assert_called_once_with(sample_location_df['nominatim_area'].unique().tolist())
 
     def test_map_area_coordinates_creates_new_file(self, mapper, sample_location_df, sample_location_mapping):
         """Test that new coordinates file is created if not exists"""
@@ -426,55 +475,6 @@ class TestAreaMapperMapAreaCoordinates:
             # Should handle gracefully
             assert 'latitude' in result.columns
 
-    def test_map_area_coordinates_case_insensitive_matching(self, mapper):
-        """Test that area matching is case-insensitive"""
-        df = pd.DataFrame({
-            'nominatim_area': ['MELBOURNE CBD', 'Melbourne CBD', 'melbourne cbd']
-        })
-        
-        mapping = [
-            {"query_area": "melbourne cbd", "lat": "-37.8136", "lon": "144.9631"}
-        ]
-        
-        with patch.object(mapper, '_find_area_coordinates', return_value=mapping):
-            result = mapper.map_area_coordinates(df)
-            
-            # All should map to same coordinates
-            assert all(result['latitude'] == "-37.8136")
-
-    def test_map_area_coordinates_strips_whitespace(self, mapper):
-        """Test that whitespace is stripped for matching"""
-        df = pd.DataFrame({
-            'nominatim_area': ['  melbourne cbd  ', 'melbourne cbd']
-        })
-        
-        mapping = [
-            {"query_area": "melbourne cbd", "lat": "-37.8136", "lon": "144.9631"}
-        ]
-        
-        with patch.object(mapper, '_find_area_coordinates', return_value=mapping):
-            result = mapper.map_area_coordinates(df)
-            
-            # Both should match
-            assert all(result['latitude'] == "-37.8136")
-
-    def test_map_area_coordinates_handles_duplicate_areas(self, mapper):
-        """Test handling of duplicate areas in input"""
-        df = pd.DataFrame({
-            'nominatim_area': ['melbourne cbd', 'melbourne cbd', 'melbourne cbd']
-        })
-        
-        mapping = [
-            {"query_area": "melbourne cbd", "lat": "-37.8136", "lon": "144.9631"}
-        ]
-        
-        with patch.object(mapper, '_find_area_coordinates', return_value=mapping):
-            result = mapper.map_area_coordinates(df)
-            
-            # All rows should have same coordinates
-            assert all(result['latitude'] == "-37.8136")
-            assert all(result['longitude'] == "144.9631")
-
     def test_map_area_coordinates_preserves_original_columns(self, mapper, sample_location_df, sample_location_mapping):
         """Test that original DataFrame columns are preserved"""
         original_cols = list(sample_location_df.columns)
@@ -485,33 +485,6 @@ class TestAreaMapperMapAreaCoordinates:
             for col in original_cols:
                 assert col in result.columns
 
-    def test_map_area_coordinates_logs_loading_existing(self, mapper, sample_location_df, sample_location_mapping):
-        """Test that loading existing file is logged"""
-        coords_file = mapper.save_dir / mapper.area_coordinates_fname
-        with open(coords_file, 'w') as f:
-            json.dump(sample_location_mapping, f)
-        
-        mapper.map_area_coordinates(sample_location_df)
-        
-        # Should log that file was found and loaded
-        assert mapper.logger.info.called
-
-    def test_map_area_coordinates_logs_creating_new(self, mapper, sample_location_df, sample_location_mapping):
-        """Test that creating new mapping is logged"""
-        with patch.object(mapper, '_find_area_coordinates', return_value=sample_location_mapping):
-            mapper.map_area_coordinates(sample_location_df)
-            
-            # Should log that file doesn't exist and is being created
-            assert mapper.logger.info.called
-
-    def test_map_area_coordinates_logs_save(self, mapper, sample_location_df, sample_location_mapping):
-        """Test that saving is logged"""
-        with patch.object(mapper, '_find_area_coordinates', return_value=sample_location_mapping):
-            mapper.map_area_coordinates(sample_location_df)
-            
-            # Should log save location
-            assert mapper.logger.info.called
-
     def test_map_area_coordinates_handles_malformed_mapping(self, mapper, sample_location_df):
         """Test handling of malformed mapping data"""
         malformed_mapping = [
@@ -552,17 +525,24 @@ class TestAreaMapperMapAreaCoordinates:
             assert len(called_areas) == 2  # Only 'area1' and 'area2'
             assert set(called_areas) == {'area1', 'area2'}
 
-    def test_map_area_coordinates_tuple_unpacking(self, mapper):
-        """Test that coordinate tuples are unpacked correctly"""
-        df = pd.DataFrame({'nominatim_area': ['test']})
-        
+    @pytest.mark.parametrize(
+        "areas",
+        [
+            ['test'],  # Tuple unpacking of a single area
+            ['MELBOURNE CBD', 'Melbourne CBD', 'melbourne cbd'],  # Case-insensitive matching
+            ['  melbourne cbd  ', 'melbourne cbd'],  # Whitespace is stripped for matching
+            ['melbourne cbd', 'melbourne cbd', 'melbourne cbd']  # Duplicate areas
+        ]
+    )
+    def test_map_area_coordinates_matches_area_names(self, mapper, areas):
+        """Test that every spelling of a mapped area gets its coordinates"""
+        df = pd.DataFrame({'nominatim_area': areas})
         mapping = [
-            {"query_area": "test", "lat": "-37.8136", "lon": "144.9631"}
+            {"query_area": areas[-1], "lat": "-37.8136", "lon": "144.9631"}
         ]
         
         with patch.object(mapper, '_find_area_coordinates', return_value=mapping):
             result = mapper.map_area_coordinates(df)
             
-            # Check that unpacking worked
-            assert result.loc[0, 'latitude'] == "-37.8136"
-            assert result.loc[0, 'longitude'] == "144.9631"
\ No newline at end of file
+            assert all(result['latitude'] == "-37.8136")
+            assert all(result['longitude'] == "144.9631")
@@ -1,10 +1,10 @@
+import os
 from pathlib import Path
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import threading
 
 import pytest
-from unittest.mock import patch
-import urllib
+from unittest.mock import patch, MagicMock
+import requests
 
 from src.downloader import Downloader
 
@@ -23,6 +23,17 @@ class TestDownloader:
         assert dl.logger is not None
 
 
+    def test_init_creates_shared_session(self):
+        """Test that __init__ creates one HTTP session with retries for all downloads"""
+        dl = Downloader()
+        assert isinstance(dl.session, requests.Session)
+        assert dl.session.get_adapter('https://example.com').max_retries.total == 3
+        assert dl.chunk_size == 1 << 20
+        assert dl.timeout == 30
+        assert dl.max_workers == 6
+        assert dl.session.get_adapter('https://example.com')._pool_maxsize == dl.max_workers
+
+
     def test_logger_configured_correctly(self):
         """Test that logger is configured on initialization"""
         dl = Downloader()
@@ -79,79 +90,198 @@ class TestDownloader:
 
     
     # Test _download method
-    def test_download_success(self, downloader, mock_urlretrieve, tmp_path):
+    def test_download_success(self, downloader, mock_get, tmp_path):
         """Test successful file download"""
         url = "https://example.com/file.csv"
         save_path = tmp_path / "test_file.csv"
         
         downloader._download(url, save_path)
         
-        mock_urlretrieve.assert_called_once_with(url, save_path)
+        mock_get.assert_called_once_with(url, headers={}, stream=True, timeout=downloader.timeout)
+        assert save_path.read_bytes() == b'col1,col2\n1,2\n'
+        assert not (tmp_path / "test_file.csv.part").exists()
+        assert not (tmp_path / "test_file.csv.part.validator").exists()
+        assert (tmp_path / "test_file.csv.etag").read_text() == '"abc123"'
         downloader.logger.info.assert_any_call(f"Downloading {url} to {save_path}...")
         downloader.logger.info.assert_any_call(f"Downloaded {url} to {save_path}")
 
-    
-    # Test _download method when network error occurs
-    def test_download_handles_network_error(self, downloader, mock_urlretrieve, tmp_path):
-        """Test that _download handles network errors gracefully"""
+
+    # Test _download method when a previous download was interrupted
+    def test_download_resumes_partial_file(self, downloader, mock_get, tmp_path):
+        """Test that _download requests only the missing bytes of a partial file"""
         url = "https://example.com/file.csv"
         save_path = tmp_path / "test_file.csv"
+        (tmp_path / "test_file.csv.part").write_bytes(b'col1,col2\n')
+        (tmp_path / "test_file.csv.part.validator").write_text('"abc123"')
+        response = mock_get.return_value.__enter__.return_value
+        response.status_code = 206
+        response.headers['Content-Range'] = 'bytes 10-13/14'
+        response.iter_content.return_value = [b'1,2\n']
         
-        mock_urlretrieve.side_effect = urllib.error.URLError("Network error")
+        downloader._download(url, save_path)
+        
+        headers = mock_get.call_args.kwargs['headers']
+        assert headers == {'Range': 'bytes=10-', 'If-Range': '"abc123"'}
+        assert save_path.read_bytes() == b'col1,col2\n1,2\n'
+        assert not (tmp_path / "test_file.csv.part").exists()
+
+
+    @pytest.mark.parametrize(
+        "status_code, content_range",
+        [
+            (206, 'bytes 0-13/14'),  # The body does not start where the partial file ends
+            (206, None),  # The start of the body cannot be checked
+            (416, 'bytes */8'),  # The file on the server is shorter than the partial file
+        ]
+    )
+    def test_download_restarts_mismatched_partial_file(self, downloader, mock_get, tmp_path, status_code, content_range):
+        """Test that _download discards a partial file that does not line up with the server and downloads it in full"""
+        url = "https://example.com/file.csv"
+        save_path = tmp_path / "test_file.csv"
+        (tmp_path / "test_file.csv.part").write_bytes(b'col1,col2\n')
+        (tmp_path / "test_file.csv.part.validator").write_text('"abc123"')
+        full_response = mock_get.return_value
+        range_response = MagicMock()
+        range_response.__enter__.return_value.status_code = status_code
+        range_response.__enter__.return_value.headers = {'Content-Range': content_range} if content_range else {}
+        range_response.__enter__.return_value.iter_content.return_value = [b'col1,col2\n1,2\n']
+        mock_get.side_effect = lambda url, headers, **kwargs: range_response if 'Range' in headers else full_response
         
-        # Should not raise exception
         downloader._download(url, save_path)
         
-        downloader.logger.error.assert_called_once()
-        assert "Failed to download" in downloader.logger.error.call_args[0][0]
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs['headers'] == {}
+        assert save_path.read_bytes() == b'col1,col2\n1,2\n'
+        assert not (tmp_path / "test_file.csv.part").exists()
+        assert not (tmp_path / "test_file.csv.part.validator").exists()
+        downloader.logger.error.assert_not_called()
 
-    
-    def test_download_handles_http_error(self, downloader, mock_urlretrieve, tmp_path):
-        """Test that _download handles HTTP errors (404, 500, etc.)"""
-        url = "https://example.com/nonexistent.csv"
+
+    def test_download_promotes_complete_partial_file(self, downloader, mock_get, tmp_path):
+        """Test that a partial file the server reports as complete (416) is moved into place"""
+        url = "https://example.com/file.csv"
         save_path = tmp_path / "test_file.csv"
+        (tmp_path / "test_file.csv.part").write_bytes(b'col1,col2\n1,2\n')
+        (tmp_path / "test_file.csv.part.validator").write_text('"abc123"')
+        response = mock_get.return_value.__enter__.return_value
+        response.status_code = 416
+        response.headers = {'Content-Range': 'bytes */14'}
+        response.raise_for_status.side_effect = requests.HTTPError("416 Client Error: Range Not Satisfiable")
         
-        mock_urlretrieve.side_effect = urllib.error.HTTPError(
-            url, 404, "Not Found", {}, None
-        )
+        downloader._download(url, save_path)
+        
+        mock_get.assert_called_once()
+        response.iter_content.assert_not_called()
+        assert save_path.read_bytes() == b'col1,col2\n1,2\n'
+        assert not (tmp_path / "test_file.csv.part").exists()
+        assert not (tmp_path / "test_file.csv.part.validator").exists()
+        downloader.logger.error.assert_not_called()
+
+
+    def test_download_restarts_when_range_is_ignored(self, downloader, mock_get, tmp_path):
+        """Test that _download overwrites the partial file when the server sends the whole file"""
+        url = "https://example.com/file.csv"
+        save_path = tmp_path / "test_file.csv"
+        (tmp_path / "test_file.csv.part").write_bytes(b'stale')
+        (tmp_path / "test_file.csv.part.validator").write_text('"old"')
         
         downloader._download(url, save_path)
         
-        downloader.logger.error.assert_called_once()
-        assert "Failed to download" in downloader.logger.error.call_args[0][0]
+        assert save_path.read_bytes() == b'col1,col2\n1,2\n'
 
 
-    def test_download_handles_permission_error(self, downloader, mock_urlretrieve, tmp_path):
-        """Test that _download handles permission errors"""
+    # Test _download method when the file was downloaded before
+    def test_download_skips_unchanged_file(self, downloader, mock_get, tmp_path):
+        """Test that _download sends the saved ETag and keeps the file on 304 Not Modified"""
         url = "https://example.com/file.csv"
         save_path = tmp_path / "test_file.csv"
+        save_path.write_bytes(b'old')
+        (tmp_path / "test_file.csv.etag").write_text('"abc123"')
+        response = mock_get.return_value.__enter__.return_value
+        response.status_code = 304
+        
+        downloader._download(url, save_path)
         
-        mock_urlretrieve.side_effect = PermissionError("Permission denied")
+        assert mock_get.call_args.kwargs['headers'] == {'If-None-Match': '"abc123"'}
+        response.iter_content.assert_not_called()
+        assert save_path.read_bytes() == b'old'
+        downloader.logger.info.assert_any_call(f"{save_path} is up to date. Skipping...")
+
+
+    def test_download_revalidates_by_mtime_without_etag(self, downloader, mock_get, tmp_path):
+        """Test that _download falls back to If-Modified-Since when no ETag was saved"""
+        url = "https://example.com/file.csv"
+        save_path = tmp_path / "test_file.csv"
+        save_path.write_bytes(b'old')
+        os.utime(save_path, (0, 0))
         
         downloader._download(url, save_path)
         
-        downloader.logger.error.assert_called_once()
-        assert "Failed to download" in downloader.logger.error.call_args[0][0]
+        assert mock_get.call_args.kwargs['headers'] == {'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT'}
+        assert save_path.read_bytes() == b'col1,col2\n1,2\n'
 
 
-    def test_download_handles_timeout(self, downloader, mock_urlretrieve, tmp_path):
-        """Test that _download handles timeout errors"""
+    def test_download_keeps_partial_file_on_failure(self, downloader, mock_get, tmp_path):
+        """Test that an interrupted download is left as a .part file and not mistaken for a finished one"""
         url = "https://example.com/file.csv"
         save_path = tmp_path / "test_file.csv"
+        response = mock_get.return_value.__enter__.return_value
+        def interrupted(chunk_size):
+            yield b'col1,col2\n'
+            raise requests.ConnectionError("Connection reset")
+        response.iter_content.side_effect = interrupted
         
-        mock_urlretrieve.side_effect = TimeoutError("Request timed out")
+        downloader._download(url, save_path)
+        
+        assert not save_path.exists()
+        assert (tmp_path / "test_file.csv.part").read_bytes() == b'col1,col2\n'
+        assert (tmp_path / "test_file.csv.part.validator").read_text() == '"abc123"'
+        downloader.logger.error.assert_called_once()
+
+    
+    # Test _download method when the request fails
+    @pytest.mark.parametrize(
+        "error",
+        [
+            requests.ConnectionError("Network error"),
+            PermissionError("Permission denied"),
+            requests.Timeout("Request timed out")
+        ]
+    )
+    def test_download_handles_request_error(self, downloader, mock_get, tmp_path, error):
+        """Test that _download handles network, permission, and timeout errors gracefully"""
+        url = "https://example.com/file.csv"
+        save_path = tmp_path / "test_file.csv"
+        
+        mock_get.side_effect = error
+        
+        # Should not raise exception
+        downloader._download(url, save_path)
+        
+        downloader.logger.error.assert_called_once_with(f"Failed to download {url}: {error}")
+
+    
+    def test_download_handles_http_error(self, downloader, mock_get, tmp_path):
+        """Test that _download handles HTTP errors (404, 500, etc.)"""
+        url = "https://example.com/nonexistent.csv"
+        save_path = tmp_path / "test_file.csv"
+        
+        mock_get.return_value.__enter__.return_value.raise_for_status.side_effect = requests.HTTPError(
+            "404 Client Error: Not Found"
+        )
         
         downloader._download(url, save_path)
         
         downloader.logger.error.assert_called_once()
+        assert "Failed to download" in downloader.logger.error.call_args[0][0]
 
 
-    def test_download_with_invalid_path(self, downloader, mock_urlretrieve):
+    def test_download_with_invalid_path(self, downloader, mock_get):
         """Test _download with invalid file path"""
         url = "https://example.com/file.csv"
         save_path = Path("/invalid/path/file.csv")
         
-        mock_urlretrieve.side_effect = OSError("Invalid path")
+        mock_get.side_effect = OSError("Invalid path")
         
         downloader._download(url, save_path)
         
@@ -159,61 +289,62 @@ class TestDownloader:
 
 
     # Test download method (main workflow)
-    def test_download_calls_setup(self, downloader, mock_urlretrieve):
+    def test_download_calls_setup(self, downloader, mock_get):
         """Test that download() calls _setup first"""
         with patch.object(downloader, '_setup') as mock_setup:
             downloader.download()
             mock_setup.assert_called_once()
 
 
-    def test_download_downloads_air_quality(self, downloader, mock_urlretrieve):
+    def test_download_downloads_air_quality(self, downloader):
         """Test that download() downloads air quality file"""
-        downloader.download()
+        with patch.object(downloader, '_download') as mock_download:
+            downloader.download()
         
-        # Check that air quality URL was called
-        calls = mock_urlretrieve.call_args_list
-        air_quality_call = calls[0]
+        # Check that air quality URL was called, downloads run concurrently so the order is not fixed
+        air_quality_calls = [
+            call for call in mock_download.call_args_list
+            if "apps.epa.vic.gov.au" in call.kwargs['url']
+        ]
         
-        assert "apps.epa.vic.gov.au" in air_quality_call[0][0]
-        assert "air_quality" in str(air_quality_call[0][1])
+        assert len(air_quality_calls) == 1
+        assert "air_quality" in str(air_quality_calls[0].kwargs['save_path'])
 
 
-    def test_download_downloads_all_data(self, downloader, mock_urlretrieve):
+    def test_download_downloads_all_data(self, downloader, mock_get):
         """Test that download() downloads all 12 months of pedestrian and air quality data"""
         downloader.download()
         
         # Should be called 13 times: 1 air quality + 12 pedestrian files
-        assert mock_urlretrieve.call_count == 13
+        assert mock_get.call_count == 13
 
 
-    def test_download_uses_correct_month_names(self, downloader, mock_urlretrieve):
+    def test_download_uses_correct_month_names(self, downloader, mock_get):
         """Test that download() uses correct month names in URLs"""
         downloader.download()
         
         months = ['January', 'February', 'March', 'April', 'May', 'June', 
                   'July', 'August', 'September', 'October', 'November', 'December']
         
-        calls = [str(call[0][0]) for call in mock_urlretrieve.call_args_list]
+        calls = [str(call[0][0]) for call in mock_get.call_args_list]
         
         for month in months:
             assert any(month in call for call in calls)
 
 
-    def test_download_saves_to_correct_directories(self, downloader, mock_urlretrieve):
+    def test_download_saves_to_correct_directories(self, downloader):
         """Test that download() saves files to correct directories"""
-        downloader.download()
-        
-        calls = mock_urlretrieve.call_args_list
+        with patch.object(downloader, '_download') as mock_download:
+            downloader.download()
         
-        # First call should be air quality (to air_quality_dir)
-        assert 'air_quality' in str(calls[0][0][1])
+        save_paths = sorted(str(call.kwargs['save_path']) for call in mock_download.call_args_list)
         
-        # Remaining calls should be pedestrian (to pedestrian_dir)
-        for call in calls[1:]:
-            assert 'pedestrian' in str(call[0][1])
+        # One air quality file (to air_quality_dir) and twelve pedestrian files (to pedestrian_dir)
+        assert sum('air_quality' in path for path in save_paths) == 1
+        assert sum('pedestrian' in path for path in save_paths) == 12
 
 
-    def test_download_logs_completion(self, downloader, mock_urlretrieve):
+    def test_download_logs_completion(self, downloader, mock_get):
         """Test that download() logs completion message"""
         downloader.download()
         
@@ -222,26 +353,55 @@ class TestDownloader:
         assert any("Download completed" in msg for msg in log_messages)
 
     
-    def test_download_continues_on_single_failure(self, downloader, mock_urlretrieve):
+    def test_download_continues_on_single_failure(self, downloader, mock_get):
         """Test that download() continues downloading even if one file fails"""
-        # Make the 3rd download fail (first pedestrian file)
-        mock_urlretrieve.side_effect = [
-            None,  # Air quality succeeds
-            None,  # January succeeds
-            urllib.error.URLError("Network error"),  # February fails
-            None, None, None, None, None, None, None, None, None, None  # Rest succeed
-        ]
+        # Make the February download fail
+        response = mock_get.return_value
+        def get(url, **kwargs):
+            if 'February' in url:
+                raise requests.ConnectionError("Network error")
+            return response
+        mock_get.side_effect = get
         
         downloader.download()
         
         # Should still attempt all 13 downloads
-        assert mock_urlretrieve.call_count == 13
+        assert mock_get.call_count == 13
+        
+        # Should log exactly the one failed download
+        downloader.logger.error.assert_called_once()
+        assert "February" in downloader.logger.error.call_args[0][0]
+
+
+    def test_download_logs_unexpected_worker_error(self, downloader):
+        """Test that download() logs an exception raised in a worker and still finishes the other files"""
+        def fake_download(url, save_path):
+            if 'March' in url:
+                raise ValueError("Unexpected error")
+        
+        with patch.object(downloader, '_download', side_effect=fake_download) as mock_download:
+            downloader.download()
         
-        # Should log at least one error
-        assert downloader.logger.error.call_count >= 1
+        assert mock_download.call_count == 13
+        downloader.logger.error.assert_called_once()
+        assert "March" in downloader.logger.error.call_args[0][0]
+        assert "Unexpected error" in downloader.logger.error.call_args[0][0]
+
 
+    @pytest.mark.parametrize('setup_error', [None, OSError("Permission denied")])
+    def test_download_closes_session(self, downloader, mock_get, setup_error):
+        """Test that download() closes the HTTP session, also when the run fails"""
+        with patch.object(downloader, '_setup', side_effect=setup_error):
+            if setup_error:
+                with pytest.raises(OSError):
+                    downloader.download()
+            else:
+                downloader.download()
+        
+        downloader.session.close.assert_called_once()
 
-    def test_download_with_pathlib_path(self, downloader, mock_urlretrieve, tmp_path):
+
+    def test_download_with_pathlib_path(self, downloader, mock_get, tmp_path):
         """Test that download works with Path objects"""
         downloader.data_dir = tmp_path / 'data'
         downloader.air_quality_dir = downloader.data_dir / 'air_quality'
@@ -252,31 +412,58 @@ class TestDownloader:
         # Should not raise any exceptions
         downloader.download()
         
-        assert mock_urlretrieve.call_count == 13
+        assert mock_get.call_count == 13
 
 
-    def test_download_with_empty_url(self, downloader, mock_urlretrieve):
+    def test_download_with_empty_url(self, downloader, mock_get):
         """Test _download with empty URL"""
+        mock_get.side_effect = requests.exceptions.MissingSchema("Invalid URL ''")
         downloader._download("", Path("test.csv"))
         
         # Should attempt to download and log error if it fails
-        mock_urlretrieve.assert_called_once()
+        mock_get.assert_called_once()
+        downloader.logger.error.assert_called_once()
 
 
-    def test_download_with_special_characters_in_path(self, downloader, mock_urlretrieve, tmp_path):
+    def test_download_with_special_characters_in_path(self, downloader, mock_get, tmp_path):
         """Test _download with special characters in file path"""
         url = "https://example.com/file.csv"
         save_path = tmp_path / "test file with spaces.csv"
         
         downloader._download(url, save_path)
         
-        mock_urlretrieve.assert_called_once_with(url, save_path)
+        assert save_path.exists()
+
+
+    def test_download_runs_concurrently(self, downloader):
+        """Test that download() runs the downloads in parallel worker threads"""
+        threads = set()
+        passed = []
+        barrier = threading.Barrier(2, timeout=5)
+        def fake_download(url, save_path):
+            threads.add(threading.get_ident())
+            # The first two downloads can only pass the barrier if they run at the same time
+            if url.endswith(('.xlsx', 'January_2022.csv')):
+                barrier.wait()
+                passed.append(url)
+        
+        with patch.object(downloader, '_download', side_effect=fake_download):
+            downloader.download()
+        
+        # A BrokenBarrierError is only logged by download(), so the barrier state and the
+        # recorded passes show whether both downloads met
+        assert not barrier.broken
+        assert len(passed) == 2
+        assert len(threads) > 1
+        assert threading.get_ident() not in threads
 
 
-    def test_multiple_download_calls(self, downloader, mock_urlretrieve):
+    def test_multiple_download_calls(self, downloader, mock_get):
         """Test calling download() multiple times"""
         downloader.download()
         downloader.download()
         
-        # Should download all files twice
-        assert mock_urlretrieve.call_count == 26  # 13 * 2
+        # Should request all files twice, the second time conditionally on the saved ETag
+        assert mock_get.call_count == 26  # 13 * 2
+        for second_call in mock_get.call_args_list[13:]:
+            assert second_call.kwargs['headers'] == {'If-None-Match': '"abc123"'}
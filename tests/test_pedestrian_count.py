@@ -1,172 +1,108 @@
-from datetime import datetime
-from pathlib import Path
-import time
-
 import pytest
+from unittest.mock import patch
 import pandas as pd
 import numpy as np
 
-from unittest.mock import Mock, patch, call
 from pandas.testing import assert_frame_equal
 
-import sys
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.pedestrian_count import PedestrianCountProcessor
 
 
+_EXPECTED_LOCATION_MAPPING = {
+    "Lincoln - Swanston (W)": "Lincoln - Swanston (West)",
+    "Harbour Esplanade - Pedestrian Path": "Harbour Esplanade (West) - Pedestrian Path",
+    "Harbour Esplanade - Bike Path": "Harbour Esplanade (West) - Bike Path",
+    "Rmit Bld 80 - 445 Swanston Street": "Rmit Building 80"
+}
+_EXPECTED_NOMINATIM_MAPPING_RULES = {
+    "Bourke St Bridge": "Bourke St",
+    "Flinders Street Station Underpass": "Flinders Street Station",
+    "Melbourne Convention Exhibition Centre": "MCEC",
+    "Qv Market": "Queen Victoria Market",
+    "Qvm": "Queen Victoria Market",
+    "Rmit Building 14": "RMIT Building",
+    "Rmit Building 80": "RMIT Building"
+}
+_EXPECTED_COLS_TO_ADD = [
+    "William St - Little Lonsdale St (West)",
+    "Errol St (West)",
+    "Flagstaff Station (East)",
+    "380 Elizabeth St",
+    "La Trobe St - William St (South)"
+]
+# Raw dates shared by the _cast_column_types and _handle_null_values tests, copied before use
+_RAW_DATES_DF = pd.DataFrame({'Date': ['01/01/2022', '02/01/2022']})
+# Every method rejects an empty frame before touching it, so one instance is shared
+_EMPTY_DF = pd.DataFrame()
+
+
 class TestPedestrianCountProcessor:
     """Test suite for the PedestrianCountProcessor class"""
 
     ### Test initialization ###
-    def test_init_creates_instance(self):
+    def test_init_creates_instance(self, pedestrian_count_processor):
         """Test that __init__ creates a valid instance"""
-        processor = PedestrianCountProcessor()
-        
-        assert processor is not None
-        assert isinstance(processor, PedestrianCountProcessor)
-        assert processor.logger is not None
+        assert pedestrian_count_processor is not None
+        assert isinstance(pedestrian_count_processor, PedestrianCountProcessor)
+        assert pedestrian_count_processor.logger is not None
 
 
-    def test_init_sets_location_mapping(self):
+    def test_init_sets_location_mapping(self, pedestrian_count_processor):
         """Test that location_mapping is set correctly"""
-        processor = PedestrianCountProcessor()
-        
-        assert hasattr(processor, 'location_mapping')
-        assert isinstance(processor.location_mapping, dict)
-        assert len(processor.location_mapping) == 4
+        assert hasattr(pedestrian_count_processor, 'location_mapping')
+        assert isinstance(pedestrian_count_processor.location_mapping, dict)
+        assert len(pedestrian_count_processor.location_mapping) == 4
 
     
-    def test_init_location_mapping_has_correct_rules(self):
+    def test_init_location_mapping_has_correct_rules(self, pedestrian_count_processor):
         """Test that location_mapping has all expected rules"""
-        processor = PedestrianCountProcessor()
-        
-        expected_keys = {
-            "Lincoln - Swanston (W)": "Lincoln - Swanston (West)",
-            "Harbour Esplanade - Pedestrian Path": "Harbour Esplanade (West) - Pedestrian Path",
-            "Harbour Esplanade - Bike Path": "Harbour Esplanade (West) - Bike Path",
-            "Rmit Bld 80 - 445 Swanston Street": "Rmit Building 80"
-        }
-        
-        for key, value in expected_keys.items():
-            assert key in processor.location_mapping
-            assert processor.location_mapping[key] == value
+        # Comparing the whole dict also rules out extra, empty, or non-string rules
+        assert pedestrian_count_processor.location_mapping == _EXPECTED_LOCATION_MAPPING
 
     
-    def test_init_location_mapping_values_are_strings(self):
-        """Test that all location_mapping values are strings"""
-        processor = PedestrianCountProcessor()
-        
-        for key, value in processor.location_mapping.items():
-            assert isinstance(key, str)
-            assert isinstance(value, str)
-
-    
-    def test_init_location_mapping_no_empty_strings(self):
-        """Test that location_mapping has no empty strings"""
-        processor = PedestrianCountProcessor()
-        
-        for key, value in processor.location_mapping.items():
-            assert len(key) > 0
-            assert len(value) > 0
-
-
-    def test_init_sets_nominatim_mapping_rules(self):
+    def test_init_sets_nominatim_mapping_rules(self, pedestrian_count_processor):
         """Test that nominatim_mapping_rules is set correctly"""
-        processor = PedestrianCountProcessor()
-        
-        assert hasattr(processor, 'nominatim_mapping_rules')
-        assert isinstance(processor.nominatim_mapping_rules, dict)
-        assert len(processor.nominatim_mapping_rules) == 7
+        assert hasattr(pedestrian_count_processor, 'nominatim_mapping_rules')
+        assert isinstance(pedestrian_count_processor.nominatim_mapping_rules, dict)
+        assert len(pedestrian_count_processor.nominatim_mapping_rules) == 7
 
 
-    def test_init_nominatim_mapping_rules_has_correct_rules(self):
+    def test_init_nominatim_mapping_rules_has_correct_rules(self, pedestrian_count_processor):
         """Test that nominatim_mapping_rules has all expected rules"""
-
-        processor = PedestrianCountProcessor()
-        
-        expected_mapping = {
-            "Bourke St Bridge": "Bourke St",
-            "Flinders Street Station Underpass": "Flinders Street Station",
-            "Melbourne Convention Exhibition Centre": "MCEC",
-            "Qv Market": "Queen Victoria Market",
-            "Qvm": "Queen Victoria Market",
-            "Rmit Building 14": "RMIT Building",
-            "Rmit Building 80": "RMIT Building"
-        }
-
-        for key, value in expected_mapping.items():
-            assert key in processor.nominatim_mapping_rules
-            assert processor.nominatim_mapping_rules[key] == value
-
-
-    def test_init_nominatim_mapping_values_are_strings(self):
-        """Test that all nominatim_mapping_rules values are strings"""
-        processor = PedestrianCountProcessor()
-        
-        for key, value in processor.nominatim_mapping_rules.items():
-            assert isinstance(key, str)
-            assert isinstance(value, str)
-
-
-    def test_init_nominatim_mapping_no_empty_strings(self):
-        """Test that nominatim_mapping_rules has no empty strings"""
-        processor = PedestrianCountProcessor()
-        
-        for key, value in processor.nominatim_mapping_rules.items():
-            assert len(key) > 0
-            assert len(value) > 0
+        # Comparing the whole dict also rules out extra, empty, or non-string rules
+        assert pedestrian_count_processor.nominatim_mapping_rules == _EXPECTED_NOMINATIM_MAPPING_RULES
 
 
-    def test_init_sets_cols_to_add(self):
+    def test_init_sets_cols_to_add(self, pedestrian_count_processor):
         """Test that cols_to_add is set correctly"""
-        processor = PedestrianCountProcessor()
-        
-        assert hasattr(processor, 'cols_to_add')
-        assert isinstance(processor.cols_to_add, list)
-        assert len(processor.cols_to_add) == 5
+        assert hasattr(pedestrian_count_processor, 'cols_to_add')
+        assert isinstance(pedestrian_count_processor.cols_to_add, list)
+        assert len(pedestrian_count_processor.cols_to_add) == 5
 
 
-    def test_init_cols_to_add_has_correct_values(self):
+    def test_init_cols_to_add_has_correct_values(self, pedestrian_count_processor):
         """Test that cols_to_add has all expected values"""
-        processor = PedestrianCountProcessor()
-        
-        expected_cols = [
-            "William St - Little Lonsdale St (West)",
-            "Errol St (West)",
-            "Flagstaff Station (East)",
-            "380 Elizabeth St",
-            "La Trobe St - William St (South)"
-        ]
-        
-        assert processor.cols_to_add == expected_cols
-
-
-    def test_init_cols_to_add_all_strings(self):
-        """Test that all cols_to_add values are strings"""
-        processor = PedestrianCountProcessor()
-        
-        for col in processor.cols_to_add:
-            assert isinstance(col, str)
-
-
-    def test_init_cols_to_add_no_empty_strings(self):
-        """Test that cols_to_add has no empty strings"""
-        processor = PedestrianCountProcessor()
-        
-        for col in processor.cols_to_add:
-            assert len(col) > 0
+        assert pedestrian_count_processor.cols_to_add == _EXPECTED_COLS_TO_ADD
 
 
-    def test_init_cols_to_add_no_duplicates(self):
+    def test_init_cols_to_add_no_duplicates(self, pedestrian_count_processor):
         """Test that cols_to_add has no duplicate entries"""
-        processor = PedestrianCountProcessor()
-        
-        assert len(processor.cols_to_add) == len(set(processor.cols_to_add))
+        assert len(pedestrian_count_processor.cols_to_add) == len(set(pedestrian_count_processor.cols_to_add))
 
     ### End of test initialization ###
 
+    ### Test empty dataframe handling ###
+    @pytest.mark.parametrize(
+        "method",
+        ["_clean_columns", "_cast_column_types", "_handle_null_values", "clean", "wrangle", "transform"]
+    )
+    def test_empty_dataframe_raises(self, pedestrian_count_processor, method):
+        """Test that methods raise an error when the dataframe is empty"""
+        with pytest.raises(Exception):
+            getattr(pedestrian_count_processor, method)(_EMPTY_DF)
+
+    ### End of test empty dataframe handling ###
+
     ### Test _clean_columns method ###
     def test_clean_columns_returns_dataframe(self, pedestrian_count_processor):
         """Test that _clean_columns returns a DataFrame"""
@@ -187,41 +123,74 @@ class TestPedestrianCountProcessor:
         assert result.iloc[1, 1] == 5
 
 
-    def test_clean_columns_converts_to_title_case(self, pedestrian_count_processor):
-        """Test that column names are converted to title case"""
-        df = pd.DataFrame({'lowercase': [1], 'UPPERCASE': [2], 'MiXeD': [3]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Lowercase' in result.columns
-        assert 'Uppercase' in result.columns
-        assert 'Mixed' in result.columns
-
-
-    def test_clean_columns_standardizes_hyphens(self, pedestrian_count_processor):
-        """Test that hyphens are standardized with spaces"""
-        df = pd.DataFrame({'word-word': [1], 'a-b': [2]})
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            # Title case
+            ("lowercase", "Lowercase"),
+            ("UPPERCASE", "Uppercase"),
+            ("MiXeD", "Mixed"),
+            ("first second third", "First Second Third"),
+            ("abc def", "Abc Def"),
+            ("a b c", "A B C"),
+            # Hyphens get a single space on each side
+            ("word-word", "Word - Word"),
+            ("a-b", "A - B"),
+            ("a-b-c-d", "A - B - C - D"),
+            ("first-second-third", "First - Second - Third"),
+            ("x-y-z", "X - Y - Z"),
+            ("word - word", "Word - Word"),
+            ("a - b - c", "A - B - C"),
+            ("word--hyphen", "Word - - Hyphen"),
+            ("test---name", "Test - - - Name"),
+            (
+                "this-is-a-very-long-column-name-with-many-hyphens-and-words",
+                "This - Is - A - Very - Long - Column - Name - With - Many - Hyphens - And - Words"
+            ),
+            # Extra whitespace
+            ("word  with   spaces", "Word With Spaces"),
+            ("multiple    spaces", "Multiple Spaces"),
+            ("tab\there", "Tab Here"),
+            # Numbers
+            ("column1", "Column1"),
+            ("test2name", "Test2Name"),
+            ("123abc", "123Abc"),
+            ("col-123", "Col - 123"),
+            ("456-test", "456 - Test"),
+            ("abc-456-def", "Abc - 456 - Def"),
+            # Special characters are preserved
+            ("word(test)", "Word(Test)"),
+            ("(start)", "(Start)"),
+            ("end(test)", "End(Test)"),
+            ("word_with_underscore", "Word_With_Underscore"),
+            ("test_123", "Test_123"),
+            ("word.name", "Word.Name"),
+            ("test.2.name", "Test.2.Name"),
+            ("word@test", "Word@Test"),
+            ("test#name", "Test#Name"),
+            ("data$value", "Data$Value"),
+            # Unicode
+            ("café-name", "Café - Name"),
+            ("señor-test", "Señor - Test"),
+            ("测试-column", "测试 - Column"),
+            # Realistic Melbourne location names
+            ("bourke-st-mall", "Bourke - St - Mall"),
+            ("flinders  street  station", "Flinders Street Station"),
+            ("  federation-square  ", "Federation - Square"),
+            ("MELBOURNE-CENTRAL", "Melbourne - Central"),
+            ("lincoln-swanston-(w)", "Lincoln - Swanston - (W)"),
+            ("elizabeth st (north)", "Elizabeth St (North)"),
+            ("collins-st-(south)", "Collins - St - (South)")
+        ]
+    )
+    def test_clean_columns_cleans_names(self, pedestrian_count_processor, raw, expected):
+        """Test that column names are title cased with standardized hyphens and whitespace"""
+        df = pd.DataFrame({raw: [1]})
         result = pedestrian_count_processor._clean_columns(df)
         
-        # Should have spaces around hyphens
-        assert 'Word - Word' in result.columns
-        assert 'A - B' in result.columns
+        assert list(result.columns) == [expected]
 
 
-    def test_clean_columns_removes_extra_spaces(self, pedestrian_count_processor):
-        """Test that extra spaces are removed"""
-        df = pd.DataFrame({
-            'word  with   spaces': [1],
-            'multiple    spaces': [2],
-            'tab\there': [3]
-        })
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        # Should have single spaces only
-        expected_cols = ['Word With Spaces', 'Multiple Spaces', 'Tab Here']
-        for col in expected_cols:
-            assert col in result.columns
-
-    
     def test_clean_columns_strips_leading_trailing_spaces(self, pedestrian_count_processor):
         """Test that leading and trailing spaces are removed"""
         df = pd.DataFrame({
@@ -236,119 +205,6 @@ class TestPedestrianCountProcessor:
             assert col == col.strip()
 
 
-    def test_clean_columns_handles_single_hyphen(self, pedestrian_count_processor):
-        """Test handling of single hyphen without spaces"""
-        df = pd.DataFrame({'a-b': [1]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'A - B' in result.columns
-
-
-    def test_clean_columns_handles_multiple_hyphens(self, pedestrian_count_processor):
-        """Test handling of multiple hyphens"""
-        df = pd.DataFrame({'a-b-c-d': [1]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'A - B - C - D' in result.columns
-
-
-    def test_clean_columns_handles_hyphen_with_existing_spaces(self, pedestrian_count_processor):
-        """Test handling of hyphens that already have spaces"""
-        df = pd.DataFrame({'word - word': [1], 'a - b - c': [2]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        # Should still be properly formatted
-        assert 'Word - Word' in result.columns
-        assert 'A - B - C' in result.columns
-
-
-    def test_clean_columns_preserves_numbers(self, pedestrian_count_processor):
-        """Test that numbers in column names are preserved"""
-        df = pd.DataFrame({'column1': [1], 'test2name': [2], '123abc': [3]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Column1' in result.columns
-        assert 'Test2Name' in result.columns
-        assert '123Abc' in result.columns
-
-
-    def test_clean_columns_handles_parentheses(self, pedestrian_count_processor):
-        """Test handling of parentheses in column names"""
-        df = pd.DataFrame({'word(test)': [1], '(start)': [2], 'end(test)': [3]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Word(Test)' in result.columns
-        assert '(Start)' in result.columns
-        assert 'End(Test)' in result.columns
-
-
-    def test_clean_columns_handles_underscores(self, pedestrian_count_processor):
-        """Test handling of underscores"""
-        df = pd.DataFrame({'word_with_underscore': [1], 'test_123': [2]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Word_With_Underscore' in result.columns
-        assert 'Test_123' in result.columns
-
-
-    def test_clean_columns_handles_dots(self, pedestrian_count_processor):
-        """Test handling of dots/periods"""
-        df = pd.DataFrame({'word.name': [1], 'test.2.name': [2]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Word.Name' in result.columns
-        assert 'Test.2.Name' in result.columns
-
-
-    def test_clean_columns_handles_special_characters(self, pedestrian_count_processor):
-        """Test handling of various special characters"""
-        df = pd.DataFrame({
-            'word@test': [1],
-            'test#name': [2],
-            'data$value': [3]
-        })
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        # Special characters should be preserved
-        assert 'Word@Test' in result.columns
-        assert 'Test#Name' in result.columns
-        assert 'Data$Value' in result.columns
-
-
-    def test_clean_columns_title_case_after_hyphen(self, pedestrian_count_processor):
-        """Test that words after hyphens are capitalized"""
-        df = pd.DataFrame({'first-second-third': [1]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'First - Second - Third' in result.columns
-
-
-    def test_clean_columns_title_case_after_space(self, pedestrian_count_processor):
-        """Test that words after spaces are capitalized"""
-        df = pd.DataFrame({'first second third': [1]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'First Second Third' in result.columns
-
-
-    def test_clean_columns_title_case_with_abbreviations(self, pedestrian_count_processor):
-        """Test title case with common abbreviations"""
-        df = pd.DataFrame({'abc def': [1], 'xyz test': [2]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Abc Def' in result.columns
-        assert 'Xyz Test' in result.columns
-
-
-    def test_clean_columns_title_case_single_letter(self, pedestrian_count_processor):
-        """Test title case with single letters"""
-        df = pd.DataFrame({'a b c': [1], 'x-y-z': [2]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'A B C' in result.columns
-        assert 'X - Y - Z' in result.columns
-
-
     def test_clean_columns_multiple_columns(self, pedestrian_count_processor):
         """Test cleaning multiple columns at once"""
         df = pd.DataFrame({
@@ -359,11 +215,7 @@ class TestPedestrianCountProcessor:
         })
         result = pedestrian_count_processor._clean_columns(df)
         
-        assert 'First - Column' in result.columns
-        assert 'Second Column' in result.columns
-        assert 'Third - Column' in result.columns
-        assert 'Fourth Column' in result.columns
-        assert len(result.columns) == 4
+        assert list(result.columns) == ['First - Column', 'Second Column', 'Third - Column', 'Fourth Column']
 
 
     def test_clean_columns_preserves_column_order(self, pedestrian_count_processor):
@@ -394,14 +246,6 @@ class TestPedestrianCountProcessor:
         assert len(result.columns) == 3
 
 
-    def test_clean_columns_empty_dataframe(self, pedestrian_count_processor):
-        """Test cleaning empty dataframe"""
-        df = pd.DataFrame()
-        # Should raise an error when the dataframe is empty
-        with pytest.raises(Exception):
-            pedestrian_count_processor._clean_columns(df)
-
-
     def test_clean_columns_single_column(self, pedestrian_count_processor):
         """Test cleaning single column"""
         df = pd.DataFrame({'test-column': [1, 2, 3]})
@@ -411,70 +255,13 @@ class TestPedestrianCountProcessor:
         assert len(result.columns) == 1
 
 
-    def test_clean_columns_very_long_column_name(self, pedestrian_count_processor):
-        """Test handling of very long column names"""
-        long_name = 'this-is-a-very-long-column-name-with-many-hyphens-and-words'
-        df = pd.DataFrame({long_name: [1]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        # Should still be properly formatted
-        expected = 'This - Is - A - Very - Long - Column - Name - With - Many - Hyphens - And - Words'
-        assert expected in result.columns
-
-
     def test_clean_columns_numeric_column_names(self, pedestrian_count_processor):
         """Test handling of numeric column names"""
         df = pd.DataFrame({0: [1], 1: [2], 2: [3]})
         df.columns = df.columns.astype(str)
         result = pedestrian_count_processor._clean_columns(df)
         
-        assert '0' in result.columns
-        assert '1' in result.columns
-        assert '2' in result.columns
-
-
-    def test_clean_columns_mixed_types_in_names(self, pedestrian_count_processor):
-        """Test handling of mixed alphanumeric names"""
-        df = pd.DataFrame({
-            'col-123': [1],
-            '456-test': [2],
-            'abc-456-def': [3]
-        })
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Col - 123' in result.columns
-        assert '456 - Test' in result.columns
-        assert 'Abc - 456 - Def' in result.columns
-
-
-    def test_clean_columns_real_location_names(self, pedestrian_count_processor):
-        """Test with realistic Melbourne location names"""
-        df = pd.DataFrame({
-            'bourke-st-mall': [1],
-            'flinders  street  station': [2],
-            '  federation-square  ': [3],
-            'MELBOURNE-CENTRAL': [4]
-        })
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Bourke - St - Mall' in result.columns
-        assert 'Flinders Street Station' in result.columns
-        assert 'Federation - Square' in result.columns
-        assert 'Melbourne - Central' in result.columns
-
-
-    def test_clean_columns_with_directional_indicators(self, pedestrian_count_processor):
-        """Test with directional indicators (West, East, etc.)"""
-        df = pd.DataFrame({
-            'lincoln-swanston-(w)': [1],
-            'elizabeth st (north)': [2],
-            'collins-st-(south)': [3]
-        })
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        assert 'Lincoln - Swanston - (W)' in result.columns
-        assert 'Elizabeth St (North)' in result.columns
-        assert 'Collins - St - (South)' in result.columns
+        assert list(result.columns) == ['0', '1', '2']
 
 
     def test_clean_columns_preserves_data_integrity(self, pedestrian_count_processor):
@@ -485,11 +272,10 @@ class TestPedestrianCountProcessor:
             '  col-3  ': [7, 8, 9]
         })
         
-        original_values = df.values.copy()
         result = pedestrian_count_processor._clean_columns(df)
         
-        # Values should be identical
-        np.testing.assert_array_equal(result.values, original_values)
+        # Values should be identical, _clean_columns renames df in place so compare against literals
+        np.testing.assert_array_equal(result.to_numpy(), [[1, 4, 7], [2, 5, 8], [3, 6, 9]])
 
     def test_clean_columns_preserves_index(self, pedestrian_count_processor):
         """Test that DataFrame index is preserved"""
@@ -535,16 +321,6 @@ class TestPedestrianCountProcessor:
             assert '  ' not in col  # No double spaces
 
 
-    def test_clean_columns_consecutive_hyphens(self, pedestrian_count_processor):
-        """Test handling of consecutive hyphens"""
-        df = pd.DataFrame({'word--hyphen': [1], 'test---name': [2]})
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        # Each hyphen should get spaces
-        assert 'Word - - Hyphen' in result.columns
-        assert 'Test - - - Name' in result.columns
-
-
     def test_clean_columns_hyphen_at_start_end(self, pedestrian_count_processor):
         """Test handling of hyphens at start/end of names"""
         df = pd.DataFrame({
@@ -569,21 +345,6 @@ class TestPedestrianCountProcessor:
         assert list(result1.columns) == list(result2.columns)
 
 
-    def test_clean_columns_unicode_characters(self, pedestrian_count_processor):
-        """Test handling of unicode characters"""
-        df = pd.DataFrame({
-            'café-name': [1],
-            'señor-test': [2],
-            '测试-column': [3]
-        })
-        result = pedestrian_count_processor._clean_columns(df)
-        
-        # Should handle unicode properly
-        assert 'Café - Name' in result.columns
-        assert 'Señor - Test' in result.columns
-        assert '测试 - Column' in result.columns
-
-
     def test_clean_columns_empty_string_column_name(self, pedestrian_count_processor):
         """Test handling of empty string as column name"""
         df = pd.DataFrame({'': [1, 2, 3]})
@@ -612,47 +373,30 @@ class TestPedestrianCountProcessor:
         assert isinstance(result, str)
 
 
-    def test_standardize_column_names_maps_exact_match(self, pedestrian_count_processor):
-        """Test that exact matches are mapped correctly"""
-        col = "Lincoln - Swanston (W)"
-        result = pedestrian_count_processor._standardize_column_names(col)
-        
-        assert result == "Lincoln - Swanston (West)"
-
-
-    def test_standardize_column_names_all_location_mappings(self, pedestrian_count_processor):
-        """Test all predefined location mappings"""
-        test_cases = {
-            "Lincoln - Swanston (W)": "Lincoln - Swanston (West)",
-            "Harbour Esplanade - Pedestrian Path": "Harbour Esplanade (West) - Pedestrian Path",
-            "Harbour Esplanade - Bike Path": "Harbour Esplanade (West) - Bike Path",
-            "Rmit Bld 80 - 445 Swanston Street": "Rmit Building 80"
-        }
-        
-        for old_name, expected_new_name in test_cases.items():
-            result = pedestrian_count_processor._standardize_column_names(old_name)
-            assert result == expected_new_name, f"Failed for {old_name}"
-
-
-    def test_standardize_column_names_returns_original_if_no_match(self, pedestrian_count_processor):
-        """Test that original column name is returned if no mapping exists"""
-        col = "Unknown Location"
+    @pytest.mark.parametrize(
+        "col, expected",
+        [
+            # Predefined location mappings
+            ("Lincoln - Swanston (W)", "Lincoln - Swanston (West)"),
+            ("Harbour Esplanade - Pedestrian Path", "Harbour Esplanade (West) - Pedestrian Path"),
+            ("Harbour Esplanade - Bike Path", "Harbour Esplanade (West) - Bike Path"),
+            ("Rmit Bld 80 - 445 Swanston Street", "Rmit Building 80"),
+            # Names without a mapping are returned unchanged
+            ("Unknown Location", "Unknown Location"),
+            ("", ""),
+            ("       ", "       "),
+            ("12345", "12345"),
+            ("Test@#$%Column", "Test@#$%Column"),
+            ("测试Column名称", "测试Column名称")
+        ]
+    )
+    def test_standardize_column_names_maps_names(self, pedestrian_count_processor, col, expected):
+        """Test that mapped names are standardized and the rest are returned unchanged"""
         result = pedestrian_count_processor._standardize_column_names(col)
         
-        assert result == col
+        assert result == expected
 
-    
-    def test_standardize_column_names_empty_or_whitespaces_string(self, pedestrian_count_processor):
-        """Test with empty string or whitespaces string"""
-        empty_string = ""
-        whitespaces_string = "       "
-        empty_string_result = pedestrian_count_processor._standardize_column_names(empty_string)
-        whitespaces_string_result = pedestrian_count_processor._standardize_column_names(whitespaces_string)
-        
-        assert empty_string_result == ""
-        assert whitespaces_string_result == "       "
 
-    
     def test_standardize_column_names_none_input(self, pedestrian_count_processor):
         """Test behavior with None input"""
         # This might raise an error or handle gracefully depending on implementation
@@ -664,54 +408,37 @@ class TestPedestrianCountProcessor:
             # It's acceptable to raise an error for None input
             assert True
 
-    
-    def test_standardize_column_names_numeric_string(self, pedestrian_count_processor):
-        """Test with numeric string"""
-        col = "12345"
-        result = pedestrian_count_processor._standardize_column_names(col)
-        
-        assert result == "12345"
-
 
-    def test_standardize_column_names_special_characters(self, pedestrian_count_processor):
-        """Test with special characters"""
-        col = "Test@#$%Column"
-        result = pedestrian_count_processor._standardize_column_names(col)
-        
-        assert result == col
+    ### End of test _standardize_column_names tests ###
 
 
-    def test_standardize_column_names_unicode_characters(self, pedestrian_count_processor):
-        """Test with unicode characters"""
-        col = "测试Column名称"
-        result = pedestrian_count_processor._standardize_column_names(col)
+    ### Test _standardize_columns method ###
+    def test_standardize_columns_matches_standardize_column_names(self, pedestrian_count_processor):
+        """Test that the vectorized renaming gives the same names as renaming column by column"""
+        cols = [
+            "Date", "Lincoln - Swanston (W)", "Harbour Esplanade - Bike Path",
+            "Rmit Bld 80 - 445 Swanston Street", "Unknown Location", "Harbour Esplanade - Pedestrian Path Extra"
+        ]
+        df = pd.DataFrame([range(len(cols))], columns=cols)
+        result = pedestrian_count_processor._standardize_columns(df)
         
-        assert result == col
+        assert list(result.columns) == [pedestrian_count_processor._standardize_column_names(col) for col in cols]
+        assert list(result.iloc[0]) == list(range(len(cols)))
 
-
-    ### End of test _standardize_column_names tests ###
+    ### End of test _standardize_columns method ###
 
     ### Test _cast_column_types method ###
     def test_cast_column_types_returns_dataframe(self, pedestrian_count_processor):
         """Test that method returns a dataframe"""
-        result = pedestrian_count_processor._cast_column_types(pd.DataFrame({'Date': ['01/01/2022', '02/01/2022']}))
+        result = pedestrian_count_processor._cast_column_types(_RAW_DATES_DF.copy())
         
         assert isinstance(result, pd.DataFrame)
 
 
-    def test_cast_column_types_empty_dataframe(self, pedestrian_count_processor):
-        """Test casting empty dataframe"""
-        df = pd.DataFrame()
-        # Should raise an error when the dataframe is empty
-        with pytest.raises(Exception):
-            pedestrian_count_processor._cast_column_types(df)
-
-    
     def test_cast_column_types_correct_date_format(self, pedestrian_count_processor):
         """Test that date column is cast to datetime with the correct format"""
-        df = pd.DataFrame({'Date': ['01/01/2022', '02/01/2022']})
-        result = pedestrian_count_processor._cast_column_types(df)
-        expected = pd.DataFrame({'Date': pd.to_datetime(['01/01/2022', '02/01/2022'], format='%d/%m/%Y')})
+        result = pedestrian_count_processor._cast_column_types(_RAW_DATES_DF.copy())
+        expected = pd.DataFrame({'Date': pd.to_datetime(_RAW_DATES_DF['Date'], format='%d/%m/%Y')})
 
         assert_frame_equal(result, expected)
         assert result['Date'].dtype == 'datetime64[ns]'
@@ -734,11 +461,11 @@ class TestPedestrianCountProcessor:
         result = pedestrian_count_processor._cast_column_types(df)
         expected = pd.DataFrame({
             'Date': pd.to_datetime(['01/01/2022', '01/01/2022', '01/01/2022'], format='%d/%m/%Y'),
-            'Value': [123, 678, 901]
+            'Value': np.array([123, 678, 901], dtype=np.int32)
         })
 
         assert_frame_equal(result, expected)
-        assert result['Value'].dtype == 'int64'
+        assert result['Value'].dtype == 'int32'
 
     
     def test_cast_column_types_invalid_int_values(self, pedestrian_count_processor):
@@ -758,19 +485,11 @@ class TestPedestrianCountProcessor:
     ### Test _handle_null_values method ###
     def test_handle_null_values_returns_dataframe(self, pedestrian_count_processor):
         """Test that method returns a dataframe"""
-        result = pedestrian_count_processor._handle_null_values(pd.DataFrame({'Date': ['01/01/2022', '02/01/2022']}))
+        result = pedestrian_count_processor._handle_null_values(_RAW_DATES_DF.copy())
         
         assert isinstance(result, pd.DataFrame)
 
 
-    def test_handle_null_values_empty_dataframe(self, pedestrian_count_processor):
-        """Test handling null values in empty dataframe"""
-        df = pd.DataFrame()
-        # Should raise an error when the dataframe is empty
-        with pytest.raises(Exception):
-            pedestrian_count_processor._handle_null_values(df)
-
-
     def test_handle_null_values_null_date(self, pedestrian_count_processor):
         """Test that null date values are handled gracefully"""
         df = pd.DataFrame({'Date': pd.to_datetime([pd.NaT, '02/01/2022'], format='%d/%m/%Y'), 'Value': [123, 123]})
@@ -788,6 +507,15 @@ class TestPedestrianCountProcessor:
 
         assert_frame_equal(result, expected)
 
+
+    def test_handle_null_values_parses_numeric_strings(self, pedestrian_count_processor):
+        """Test that numeric strings are parsed to numbers and the rest are replaced with 0"""
+        df = pd.DataFrame({'Date': pd.to_datetime(['01/01/2022', '02/01/2022', '03/01/2022'], format='%d/%m/%Y'), 'Value': ['12', '3.5', 'n/a']})
+        result = pedestrian_count_processor._handle_null_values(df)
+
+        assert result['Value'].tolist() == [12.0, 3.5, 0.0]
+        assert pd.api.types.is_numeric_dtype(result['Value'])
+
     ### End of test _handle_null_values method ###
 
 
@@ -810,7 +538,7 @@ class TestPedestrianCountProcessor:
             'Flagstaff Station (East)': [],
             'La Trobe St - William St (South)': [],
             'William St - Little Lonsdale St (West)': [],
-        }, dtype='int')
+        }, dtype=np.int32)
 
         assert_frame_equal(result, expected)
 
@@ -822,11 +550,11 @@ class TestPedestrianCountProcessor:
         expected = pd.DataFrame({
             'Date': pd.to_datetime(['01/01/2022', '02/01/2022'], format='%d/%m/%Y'), 
             'Area A': [123, 123],
-            '380 Elizabeth St': [0, 0],
-            'Errol St (West)': [0, 0],
-            'Flagstaff Station (East)': [0, 0],
-            'La Trobe St - William St (South)': [0, 0],
-            'William St - Little Lonsdale St (West)': [0, 0],
+            '380 Elizabeth St': np.zeros(2, dtype=np.int32),
+            'Errol St (West)': np.zeros(2, dtype=np.int32),
+            'Flagstaff Station (East)': np.zeros(2, dtype=np.int32),
+            'La Trobe St - William St (South)': np.zeros(2, dtype=np.int32),
+            'William St - Little Lonsdale St (West)': np.zeros(2, dtype=np.int32),
         })
 
         assert_frame_equal(result, expected)
@@ -844,10 +572,10 @@ class TestPedestrianCountProcessor:
             'Date': pd.to_datetime(['01/01/2022', '02/01/2022'], format='%d/%m/%Y'), 
             'Area A': [123, 123],
             '380 Elizabeth St': [90, 80],
-            'Errol St (West)': [0, 0],
-            'Flagstaff Station (East)': [0, 0],
-            'La Trobe St - William St (South)': [0, 0],
-            'William St - Little Lonsdale St (West)': [0, 0],
+            'Errol St (West)': np.zeros(2, dtype=np.int32),
+            'Flagstaff Station (East)': np.zeros(2, dtype=np.int32),
+            'La Trobe St - William St (South)': np.zeros(2, dtype=np.int32),
+            'William St - Little Lonsdale St (West)': np.zeros(2, dtype=np.int32),
         })
 
         assert_frame_equal(result, expected)
@@ -855,6 +583,32 @@ class TestPedestrianCountProcessor:
     ### End of test _add_missing_areas method ###
 
 
+    ### Test _merge_duplicate_areas method ###
+    def test_merge_duplicate_areas_sums_and_sorts(self, pedestrian_count_processor):
+        """Test that columns with the same name are summed and the columns are sorted"""
+        df = pd.DataFrame([[1, 10, 2, 20]], columns=['Area B', 'Area A', 'Area B', 'Date'], index=[5])
+        result = pedestrian_count_processor._merge_duplicate_areas(df)
+        expected = pd.DataFrame({'Area A': [10], 'Area B': [3], 'Date': [20]}, index=[5])
+
+        assert_frame_equal(result, expected)
+
+    ### End of test _merge_duplicate_areas method ###
+
+
+    ### Test _get_season method ###
+    def test_get_season_maps_every_month(self, pedestrian_count_processor):
+        """Test that every month is mapped to its southern hemisphere season"""
+        df = pd.DataFrame({'month': range(1, 13)})
+        result = pedestrian_count_processor._get_season(df)
+
+        assert result['season'].tolist() == [
+            'summer', 'summer', 'autumn', 'autumn', 'autumn', 'winter',
+            'winter', 'winter', 'spring', 'spring', 'spring', 'summer'
+        ]
+
+    ### End of test _get_season method ###
+
+
     ### Test _extract_area method ###
     def test_extract_area_returns_string(self, pedestrian_count_processor):
         """Test that method returns a string"""
@@ -879,30 +633,24 @@ class TestPedestrianCountProcessor:
             ("Area A", "Area A, Victoria, Australia"),
             ("Melbourne Central - Little Londsdale St (East)", "Melbourne Central, Victoria, Australia"),
             ("380 Elizabeth St", "380 Elizabeth St, Victoria, Australia"),
-            ("", ", Victoria, Australia")
-        ]
-    )
-    def test_extract_area_extracted_areas(self, pedestrian_count_processor, area, extracted_area):
-        """Test that areas are correctly extracted"""
-        result = pedestrian_count_processor._extract_area(area)
-        
-        assert result == extracted_area
-
-    @pytest.mark.parametrize(
-        "area, extracted_area", 
-        [
-            ("Area A", "Area A, Victoria, Australia"),
+            ("", ", Victoria, Australia"),
             ("Rmit Building 80 - Little Londsdale St (East)", "RMIT Building, Victoria, Australia"),
             ("Qv Market - 380 Elizabeth St", "Queen Victoria Market, Victoria, Australia"),
             ("Melbourne Central - Flinders Street Station Underpass", "Melbourne Central, Victoria, Australia")
-        ]
+        ],
+        ids=["area_a", "melbourne_central", "elizabeth_st", "empty", "rmit_rule", "qv_market_rule", "rule_only_on_first_area"]
     )
-    def test_extract_area_with_nominatim_mapping_rules(self, pedestrian_count_processor, area, extracted_area):
-        """Test that areas are correctly extracted with Nominatim mapping rules"""
+    def test_extract_area_extracted_areas(self, pedestrian_count_processor, area, extracted_area):
+        """Test that areas are correctly extracted, with the Nominatim mapping rules applied to the first area name"""
         result = pedestrian_count_processor._extract_area(area)
         
         assert result == extracted_area
 
+    def test_extract_area_splits_on_first_hyphen_or_parenthesis(self, pedestrian_count_processor):
+        """Test that the area name is cut at whichever of '-' or '(' comes first"""
+        assert pedestrian_count_processor._extract_area("Errol St (West) - North") == "Errol St, Victoria, Australia"
+        assert pedestrian_count_processor._extract_area("Southbank - Arts (Centre)") == "Southbank, Victoria, Australia"
+
     ### End of test _extract_area method ###
 
 
@@ -924,14 +672,6 @@ class TestPedestrianCountProcessor:
         assert isinstance(result, pd.DataFrame)
 
     
-    def test_clean_empty_dataframe(self, pedestrian_count_processor):
-        """Test clean method on empty dataframe"""
-        df = pd.DataFrame()
-        # Should raise an error when the dataframe is empty
-        with pytest.raises(Exception):
-            pedestrian_count_processor.clean(df)
-
-    
     def test_clean_correctly_cleans_data(self, pedestrian_count_processor, sample_raw_pedestrian_count_data):
         """Test that method correctly cleans data"""
         result = pedestrian_count_processor.clean(sample_raw_pedestrian_count_data)
@@ -949,9 +689,34 @@ class TestPedestrianCountProcessor:
             "Flagstaff Station (East)": [0, 0],
             "La Trobe St - William St (South)": [0, 0]
         })
+        expected[expected.columns.drop('Date')] = expected[expected.columns.drop('Date')].astype(np.int32)
         
         assert_frame_equal(result[expected.columns], expected)
 
+
+    def test_clean_skips_null_dates_and_non_numeric_counts(self, pedestrian_count_processor, sample_raw_pedestrian_count_data):
+        """Test that clean drops rows without a date and counts non-numeric values as 0"""
+        df = sample_raw_pedestrian_count_data.copy()
+        df.loc[1, 'Date'] = None
+        df.loc[0, 'Area A'] = 'n/a'
+        result = pedestrian_count_processor.clean(df)
+
+        assert len(result) == 1
+        assert result['Area A'].tolist() == [0]
+        assert list(result.columns) == sorted(result.columns)
+
+
+    @pytest.mark.parametrize(
+        "helper",
+        ["_clean_columns", "_handle_null_values", "_standardize_columns", "_cast_column_types", "_add_missing_areas", "_merge_duplicate_areas"]
+    )
+    def test_clean_runs_the_cleaning_helpers(self, pedestrian_count_processor, sample_raw_pedestrian_count_data, helper):
+        """Test that clean is built out of the cleaning helpers, so they are the only implementation of each step"""
+        with patch.object(pedestrian_count_processor, helper, wraps=getattr(pedestrian_count_processor, helper)) as mock_helper:
+            pedestrian_count_processor.clean(sample_raw_pedestrian_count_data)
+
+        mock_helper.assert_called_once()
+
     ### End of test clean method ###
 
 
@@ -959,10 +724,7 @@ class TestPedestrianCountProcessor:
     def test_wrangle_check_added_columns(self, pedestrian_count_processor, sample_clean_pedestrian_count_data):
         result = pedestrian_count_processor.wrangle(sample_clean_pedestrian_count_data)
 
-        assert 'datetime_AEST' in result.columns
-        assert 'area' in result.columns
-        assert 'pedestrian_count' in result.columns
-        assert 'nominatim_area' in result.columns
+        assert {'datetime_AEST', 'area', 'pedestrian_count', 'nominatim_area'} <= set(result.columns)
 
 
     def test_wrangle_returns_dataframe(self, pedestrian_count_processor, sample_clean_pedestrian_count_data):
@@ -972,14 +734,6 @@ class TestPedestrianCountProcessor:
         assert isinstance(result, pd.DataFrame)
 
     
-    def test_wrangle_empty_dataframe(self, pedestrian_count_processor):
-        """Test wrangle method on empty dataframe"""
-        df = pd.DataFrame()
-        # Should raise an error when the dataframe is empty
-        with pytest.raises(Exception):
-            pedestrian_count_processor.wrangle(df)
-
-    
     def test_wrangle_correctly_wrangles_data(self, pedestrian_count_processor, sample_clean_pedestrian_count_data):
         result = pedestrian_count_processor.wrangle(sample_clean_pedestrian_count_data)
         expected = pd.DataFrame({
@@ -1004,7 +758,7 @@ class TestPedestrianCountProcessor:
                 "La Trobe St - William St (South)",
                 "La Trobe St - William St (South)"
             ],
-            'pedestrian_count': [100, 200, 100, 200, 100, 200, 200, 400, 100, 200, 0, 0, 0, 0, 0, 0, 0, 0],
+            'pedestrian_count': np.array([100, 200, 100, 200, 100, 200, 200, 400, 100, 200, 0, 0, 0, 0, 0, 0, 0, 0], dtype=np.int32),
             'nominatim_area': [
                 'melbourne central, victoria, australia',
                 'melbourne central, victoria, australia', 
@@ -1027,8 +781,22 @@ class TestPedestrianCountProcessor:
             ]
         })
 
+        expected = expected.astype({'area': 'category', 'nominatim_area': 'category'})
+
         assert_frame_equal(result, expected)
 
+    def test_wrangle_adds_hours_to_dates(self, pedestrian_count_processor):
+        """Test that datetime_AEST is the date plus the hour, including midnight and the last hour of the day"""
+        df = pd.DataFrame({
+            'Date': pd.to_datetime(['31/12/2022', '31/12/2022'], format='%d/%m/%Y'),
+            'Hour': np.array([0, 23], dtype=np.int32),
+            'Area A': [1, 2]
+        })
+        result = pedestrian_count_processor.wrangle(df)
+
+        assert result['datetime_AEST'].tolist() == [pd.Timestamp('2022-12-31 00:00:00'), pd.Timestamp('2022-12-31 23:00:00')]
+        assert result['datetime_AEST'].dtype == 'datetime64[ns]'
+
     ### End of test wrangle method ###
 
 
@@ -1039,14 +807,6 @@ class TestPedestrianCountProcessor:
         
         assert isinstance(result, pd.DataFrame)
 
-    def test_transform_empty_dataframe(self, pedestrian_count_processor):
-        """Test transform method on empty dataframe"""
-        df = pd.DataFrame()
-        # Should raise an error when the dataframe is empty
-        with pytest.raises(Exception):
-            pedestrian_count_processor.transform(df)
-
-    
     def test_transform_correctly_transforms(self, pedestrian_count_processor, sample_raw_pedestrian_count_data):
         """Test transform method correctly transforms a raw data"""
         result = pedestrian_count_processor.transform(sample_raw_pedestrian_count_data)
@@ -1074,7 +834,7 @@ class TestPedestrianCountProcessor:
                 "William St - Little Lonsdale St (West)", 
                 "William St - Little Lonsdale St (West)"
             ],
-            'pedestrian_count': [100, 200, 100, 200, 0, 0, 0, 0, 0, 0, 100, 200, 100, 200, 100, 200, 200, 400, 0, 0],
+            'pedestrian_count': np.array([100, 200, 100, 200, 0, 0, 0, 0, 0, 0, 100, 200, 100, 200, 100, 200, 200, 400, 0, 0], dtype=np.int32),
             'nominatim_area': [
                 '380 elizabeth st, victoria, australia',
                 '380 elizabeth st, victoria, australia',
@@ -1099,6 +859,29 @@ class TestPedestrianCountProcessor:
             ]
         })
 
+        expected = expected.astype({'area': 'category', 'nominatim_area': 'category'})
+
         assert_frame_equal(result, expected)
 
-    ### End of test transform method ###
\ No newline at end of file
+    def test_transform_chunks_matches_transform(self, pedestrian_count_processor, sample_raw_pedestrian_count_data):
+        """Test that transforming chunks gives the same result as transforming the concatenated data"""
+        first_chunk = sample_raw_pedestrian_count_data.copy()
+        second_chunk = sample_raw_pedestrian_count_data.drop(columns=['Area A']).assign(**{'Errol St (West)': ['5', '6']})
+        second_chunk['Date'] = ['02/01/2022', '02/01/2022']
+        expected = pedestrian_count_processor.transform(pd.concat([first_chunk.copy(), second_chunk.copy()]))
+        
+        result = pedestrian_count_processor.transform_chunks(iter([first_chunk, second_chunk]))
+        
+        assert_frame_equal(result, expected)
+
+
+    def test_transform_chunks_logs_progress(self, pedestrian_count_processor, sample_raw_pedestrian_count_data):
+        """Test that transform_chunks logs each step"""
+        pedestrian_count_processor.transform_chunks([sample_raw_pedestrian_count_data])
+        
+        log_calls = [call[0][0] for call in pedestrian_count_processor.logger.info.call_args_list]
+        assert any("Cleaning" in msg for msg in log_calls)
+        assert any("Wrangling" in msg for msg in log_calls)
+        assert any("completed" in msg for msg in log_calls)
+
+    ### End of test transform method ###